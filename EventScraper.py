@@ -1,9 +1,32 @@
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from bs4 import BeautifulSoup, SoupStrainer
+import soupsieve
 import json
+import math
+import multiprocessing
 import re
-from datetime import datetime, timedelta
-from urllib.parse import urljoin
+from collections import Counter, deque
+from datetime import date, datetime, timedelta
+from urllib.parse import urljoin, urlparse
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from html.parser import HTMLParser
+import argparse
+import codecs
+import contextlib
+import copy
+import functools
+import gzip
+import hashlib
+import os
+import random
+import sqlite3
+import sys
+import unicodedata
+import zlib
+import threading
 import time
 
 # Complete sustainability keywords in Danish
@@ -25,11 +48,11 @@ SUSTAINABILITY_KEYWORDS = [
     'bæredygtig ngo', 'bæredygtig forening', 'bæredygtig frivillig', 'bæredygtig event',
     'bæredygtig festival', 'bæredygtig koncert', 'bæredygtig teater', 'bæredygtig film',
     'bæredygtig kunst', 'bæredygtig musik', 'bæredygtig sport', 'bæredygtig træning',
-    'bæredygtig kost', 'bæredygtig slank', 'bæredygtig sundhed', 'bæredygtig wellness',
+    'bæredygtig kost', 'bæredygtig slank', 'bæredygtig wellness',
     'bæredygtig spa', 'bæredygtig ferie', 'bæredygtig rejse', 'bæredygtig turist',
     'bæredygtig oplevelse', 'bæredygtig shopping',
     # Additional from PDF
-    'repair', 'reparation', 'løb', 'vandring', 'workshop', 'kursus', 'foredrag',
+    'repair', 'reparation', 'vandring', 'workshop', 'kursus', 'foredrag',
     'oprydning', 'clean-up', 'beach clean', 'plantning', 'dyrkning', 'læring',
     'undervisning', 'swap', 'bytte', 'fællesspisning', 'madlavning', 'genbrugsmarked',
     'loppemarked', 'brugt', 'secondhand', 'vintage', 'bæredygtigt', 'klimavenlig'
@@ -39,550 +62,1364 @@ HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
     'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
     'Accept-Language': 'da-DK,da;q=0.9,en-US;q=0.8,en;q=0.7',
-    'Accept-Encoding': 'gzip, deflate, br',
+    'Accept-Encoding': 'gzip, deflate',
     'DNT': '1',
     'Connection': 'keep-alive',
     'Upgrade-Insecure-Requests': '1'
 }
 
-def contains_sustainability_keywords(text):
-    """Check if text contains sustainability keywords."""
-    if not text:
-        return False
-    
-    text_lower = text.lower()
-    
-    # Check for all sustainability keywords
-    for keyword in SUSTAINABILITY_KEYWORDS:
-        if keyword.lower() in text_lower:
-            return True
-    
-    return False
-
-def scrape_migogaarhus():
-    """Scrape events from migogaarhus.dk/kalender/"""
-    events = []
-    url = "https://migogaarhus.dk/kalender/"
-    
+# urllib3 decodes brotli bodies transparently when a brotli module is installed,
+# so only advertise 'br' when we can actually read it. The same module writes
+# the precompressed .br output shards.
+try:
+    import brotli
+except ImportError:
     try:
-        response = requests.get(url, headers=HEADERS, timeout=15)
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Look for event listings - adjust based on actual structure
-        event_items = soup.select('article, .event-item, .post, .item')
-        
-        for item in event_items[:20]:
-            try:
-                title_elem = item.select_one('h2, h3, .title, .event-title')
-                link_elem = item.select_one('a[href]')
-                
-                if not title_elem or not link_elem:
-                    continue
-                
-                title = title_elem.get_text(strip=True)
-                link = link_elem['href']
-                if not link.startswith('http'):
-                    link = urljoin('https://migogaarhus.dk', link)
-                
-                # Try to get description
-                description_elem = item.select_one('.description, .excerpt, .content, p')
-                description = description_elem.get_text(strip=True)[:300] if description_elem else ""
-                
-                # Try to get date
-                date_elem = item.select_one('.date, .event-date, .post-date, time')
-                date_text = date_elem.get_text(strip=True) if date_elem else ""
-                
-                # Try to get location
-                location_elem = item.select_one('.location, .venue, .place')
-                location = location_elem.get_text(strip=True) if location_elem else "Aarhus"
-                
-                if contains_sustainability_keywords(f"{title} {description}"):
-                    event = {
-                        'title': title,
-                        'description': description,
-                        'date': date_text,
-                        'time': '',
-                        'location': location,
-                        'address': location,
-                        'link': link,
-                        'source': 'migogaarhus.dk',
-                        'category': 'event',
-                        'image': '',
-                        'organizer': '',
-                        'points': 100
-                    }
-                    events.append(event)
-                    
-            except Exception as e:
-                print(f"Error parsing event from migogaarhus: {e}")
-                continue
-                
-    except Exception as e:
-        print(f"Error scraping migogaarhus: {e}")
-    
-    return events
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+if brotli is not None:
+    HEADERS['Accept-Encoding'] = 'gzip, deflate, br'
 
-def scrape_tipaarhus():
-    """Scrape events from tipaarhus.dk/det-sker-i-aarhus/"""
-    events = []
-    url = "https://tipaarhus.dk/det-sker-i-aarhus/"
-    
-    try:
-        response = requests.get(url, headers=HEADERS, timeout=15)
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        event_items = soup.select('article, .post, .event, .arrangement')
-        
-        for item in event_items[:20]:
-            try:
-                title_elem = item.select_one('h2, h3, .entry-title, .title')
-                link_elem = title_elem.select_one('a') if title_elem else item.select_one('a[href]')
-                
-                if not title_elem or not link_elem:
-                    continue
-                
-                title = title_elem.get_text(strip=True)
-                link = link_elem['href']
-                if not link.startswith('http'):
-                    link = urljoin('https://tipaarhus.dk', link)
-                
-                description_elem = item.select_one('.entry-content, .excerpt, .description')
-                description = description_elem.get_text(strip=True)[:300] if description_elem else ""
-                
-                date_elem = item.select_one('.date, .post-date, .event-date')
-                date_text = date_elem.get_text(strip=True) if date_elem else ""
-                
-                location_elem = item.select_one('.location, .venue')
-                location = location_elem.get_text(strip=True) if location_elem else "Aarhus"
-                
-                if contains_sustainability_keywords(f"{title} {description}"):
-                    event = {
-                        'title': title,
-                        'description': description,
-                        'date': date_text,
-                        'time': '',
-                        'location': location,
-                        'address': location,
-                        'link': link,
-                        'source': 'tipaarhus.dk',
-                        'category': 'event',
-                        'image': '',
-                        'organizer': '',
-                        'points': 100
-                    }
-                    events.append(event)
-                    
-            except Exception as e:
-                print(f"Error parsing event from tipaarhus: {e}")
-                continue
-                
-    except Exception as e:
-        print(f"Error scraping tipaarhus: {e}")
-    
-    return events
+# Connection pooling for the shared HTTP session
+POOL_HOSTS = 16          # number of per-host pools kept alive
+POOL_PER_HOST = 4        # keep-alive connections per host
 
-def scrape_visitaarhus():
-    """Scrape events from visitaarhus.dk sustainability page"""
-    events = []
-    url = "https://www.visitaarhus.dk/aarhusregionen/baeredygtighed-i-fokus"
-    
+# HTML parser for listing pages. lxml is several times faster than the
+# pure-Python html.parser, which is kept as the fallback.
+try:
+    import lxml  # noqa: F401
+    PARSER_BACKEND = 'lxml'
+except ImportError:
+    PARSER_BACKEND = 'html.parser'
+
+# Only build the subtrees matching a source's listing selector
+PARSE_SUBTREE = True
+
+# Read listing pages incrementally and stop once a source's item cap is hit
+STREAM_LISTINGS = False
+STREAM_CHUNK_SIZE = 16 * 1024
+
+# Minimum number of seconds between two requests to the same host
+HOST_DELAY = 1.0
+
+# Number of sources fetched in parallel in concurrent mode
+MAX_WORKERS = 9
+
+# Fetch deadlines and retries
+REQUEST_TIMEOUT = 15        # seconds per request, shortened near a deadline
+RUN_DEADLINE = None         # seconds for fetching all sources, None for no limit
+SOURCE_BUDGET = 40          # seconds one source may take, retries included; not a
+                            # multiple of REQUEST_TIMEOUT, so a retry is never cut to nothing
+MAX_RETRIES = 2             # extra attempts after a transient failure
+RETRY_BASE_DELAY = 0.5      # first backoff in seconds, doubled per attempt
+RETRY_MAX_DELAY = 8.0
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Hosts that fail this many fetches in a row are skipped for a cooldown
+BREAKER_THRESHOLD = 3
+BREAKER_COOLDOWN = 60 * 60
+
+_host_locks = {}
+_host_last_request = {}
+_host_locks_guard = threading.Lock()
+
+def _lock_for_host(host):
+    """Return the lock serializing requests to one host."""
+    with _host_locks_guard:
+        if host not in _host_locks:
+            _host_locks[host] = threading.Lock()
+        return _host_locks[host]
+
+def wait_for_host(url, delay=None):
+    """Block until a request to the url's host is allowed by HOST_DELAY."""
+    host = urlparse(url).netloc
+    delay = HOST_DELAY if delay is None else delay
+    with _lock_for_host(host):
+        wait = _host_last_request.get(host, 0) + delay - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        _host_last_request[host] = time.monotonic()
+
+_session = None
+_session_guard = threading.Lock()
+_connection_counts = {'requests': 0, 'connections': 0}
+_connection_counts_guard = threading.Lock()
+
+def _count_connection(key):
+    with _connection_counts_guard:
+        _connection_counts[key] += 1
+
+# Seconds spent connecting during the current thread's request
+_request_timing = threading.local()
+
+def _timed_connect(connect):
+    _count_connection('connections')
+    start = time.perf_counter()
     try:
-        response = requests.get(url, headers=HEADERS, timeout=15)
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # This page should have sustainability content
-        content_items = soup.select('article, .content-item, .news-item, .card')
-        
-        for item in content_items[:15]:
+        connect()
+    finally:
+        _request_timing.connect = getattr(_request_timing, 'connect', 0.0) + time.perf_counter() - start
+
+class _CountingHTTPConnection(HTTPConnection):
+    def connect(self):
+        _timed_connect(super().connect)
+
+class _CountingHTTPSConnection(HTTPSConnection):
+    def connect(self):
+        _timed_connect(super().connect)
+
+class _CountingHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _CountingHTTPConnection
+
+class _CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _CountingHTTPSConnection
+
+class PooledAdapter(HTTPAdapter):
+    """HTTPAdapter whose connection pools count every new TCP connection."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _CountingHTTPConnectionPool,
+            'https': _CountingHTTPSConnectionPool,
+        }
+
+def configure_session(pool_hosts=POOL_HOSTS, pool_per_host=POOL_PER_HOST, headers=None):
+    """Create the shared keep-alive session used for every HTTP request.
+
+    pool_per_host caps the number of open connections to a single host;
+    extra requests wait for a free connection instead of opening new ones.
+    """
+    global _session
+    session = requests.Session()
+    session.headers.update(headers or HEADERS)
+    adapter = PooledAdapter(pool_connections=pool_hosts, pool_maxsize=pool_per_host,
+                            pool_block=True)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    with _session_guard:
+        old, _session = _session, session
+    with _connection_counts_guard:
+        _connection_counts.update(requests=0, connections=0)
+    if old is not None:
+        old.close()
+    return session
+
+def get_session():
+    """Return the shared session, creating it on first use."""
+    with _session_guard:
+        session = _session
+    return session if session is not None else configure_session()
+
+def connection_stats():
+    """Count requests and new connections made through the shared session."""
+    with _connection_counts_guard:
+        stats = dict(_connection_counts)
+    stats['reused'] = max(stats['requests'] - stats['connections'], 0)
+    return stats
+
+class DeadlineExceeded(requests.Timeout):
+    """The run deadline or a source's time budget ran out."""
+
+class CircuitOpen(requests.ConnectionError):
+    """A host is skipped because its recent fetches kept failing."""
+
+def configure_fetch(deadline=RUN_DEADLINE, source_budget=SOURCE_BUDGET, retries=MAX_RETRIES):
+    """Set the run deadline, per-source budget (seconds) and retry count."""
+    global RUN_DEADLINE, SOURCE_BUDGET, MAX_RETRIES
+    RUN_DEADLINE = deadline
+    SOURCE_BUDGET = source_budget
+    MAX_RETRIES = retries
+
+def _remaining(deadline):
+    """Seconds left until a time.monotonic() deadline, or None without one."""
+    return None if deadline is None else deadline - time.monotonic()
+
+class CircuitBreaker:
+    """Per-host failure counts that stop requests to hosts that keep failing.
+
+    After BREAKER_THRESHOLD failed fetches in a row a host's circuit opens
+    and requests fail fast with CircuitOpen. Once BREAKER_COOLDOWN has
+    passed, one trial request is let through; success closes the circuit,
+    failure opens it for another cooldown. The state is saved as JSON so a
+    dead host is not retried by every run.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._hosts = {}
+        self._changed = set()
+        if path:
             try:
-                title_elem = item.select_one('h2, h3, h4, .title')
-                link_elem = item.select_one('a[href]')
-                
-                if not title_elem or not link_elem:
+                with open(path, encoding='utf-8') as f:
+                    self._hosts = json.load(f)
+            except (OSError, ValueError):
+                pass
+
+    def allow(self, host):
+        """True if a request to host may be sent now."""
+        with self._lock:
+            state = self._hosts.get(host)
+            if not state or state.get('opened_at') is None:
+                return True
+            if state.get('trial') or time.time() - state['opened_at'] < BREAKER_COOLDOWN:
+                return False
+            state['trial'] = True
+            return True
+
+    def record_success(self, host):
+        with self._lock:
+            self._hosts.pop(host, None)
+            self._changed.add(host)
+
+    def end_trial(self, host):
+        """Let another trial through if this one ended without an outcome."""
+        with self._lock:
+            state = self._hosts.get(host)
+            if state:
+                state.pop('trial', None)
+
+    def record_failure(self, host):
+        with self._lock:
+            state = self._hosts.setdefault(host, {'failures': 0, 'opened_at': None})
+            state['failures'] += 1
+            self._changed.add(host)
+            if state.pop('trial', False) or state['failures'] >= BREAKER_THRESHOLD:
+                if state['opened_at'] is None or time.time() - state['opened_at'] >= BREAKER_COOLDOWN:
+                    print(f"🚧 {host}: {state['failures']} failures in a row, "
+                          f"skipping it for {BREAKER_COOLDOWN // 60} min")
+                state['opened_at'] = time.time()
+
+    def take_changes(self):
+        """{host: state or None when closed} changed here since the last call."""
+        with self._lock:
+            changes = {}
+            for host in self._changed:
+                state = self._hosts.get(host)
+                changes[host] = None if state is None else {
+                    key: value for key, value in state.items() if key != 'trial'}
+            self._changed.clear()
+            return changes
+
+    def merge(self, states):
+        """Adopt other processes' host states, keeping changes not yet taken."""
+        with self._lock:
+            for host, state in states.items():
+                if host in self._changed:
                     continue
-                
-                title = title_elem.get_text(strip=True)
-                link = link_elem['href']
-                if not link.startswith('http'):
-                    link = urljoin('https://www.visitaarhus.dk', link)
-                
-                description_elem = item.select_one('p, .description, .text')
-                description = description_elem.get_text(strip=True)[:300] if description_elem else ""
-                
-                # This page is about sustainability, so include relevant content
-                if contains_sustainability_keywords(f"{title} {description}"):
-                    event = {
-                        'title': title,
-                        'description': description,
-                        'date': 'Se link for dato',
-                        'time': '',
-                        'location': 'Aarhus region',
-                        'address': '',
-                        'link': link,
-                        'source': 'visitaarhus.dk',
-                        'category': 'sustainability',
-                        'image': '',
-                        'organizer': '',
-                        'points': 100
-                    }
-                    events.append(event)
-                    
-            except Exception as e:
-                print(f"Error parsing content from visitaarhus: {e}")
-                continue
-                
-    except Exception as e:
-        print(f"Error scraping visitaarhus: {e}")
-    
-    return events
+                if state is None:
+                    self._hosts.pop(host, None)
+                else:
+                    trial = self._hosts.get(host, {}).get('trial')
+                    self._hosts[host] = dict(state, **({'trial': True} if trial else {}))
 
-def scrape_aarhusliv():
-    """Scrape events from aarhusliv.dk"""
-    events = []
-    url = "https://aarhusliv.dk/det-sker-i-aarhus/"
-    
+    def open_hosts(self):
+        with self._lock:
+            return sorted(host for host, state in self._hosts.items()
+                          if state.get('opened_at') is not None)
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            data = json.dumps(self._hosts)
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(data)
+        os.replace(tmp_path, self.path)
+
+_breaker = None
+_breaker_guard = threading.Lock()
+
+def get_breaker():
+    """The circuit breaker stored in the current cache directory."""
+    global _breaker
+    path = os.path.join(CACHE_DIR, 'circuit_breakers.json') if CACHE_DIR else None
+    with _breaker_guard:
+        if _breaker is None or _breaker.path != path:
+            _breaker = CircuitBreaker(path)
+        return _breaker
+
+def _retry_delay(attempt, response):
+    """Jittered exponential backoff, or the server's Retry-After when it sends one."""
+    retry_after = response.headers.get('Retry-After', '') if response is not None else ''
+    if retry_after.isdigit():
+        return min(float(retry_after), RETRY_MAX_DELAY)
+    return random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt))
+
+def _get_once(url, delay, deadline, **kwargs):
+    start = time.perf_counter()
+    wait_for_host(url, delay)
+    waited = time.perf_counter() - start
+    remaining = _remaining(deadline)
+    if remaining is not None and remaining <= 0:
+        raise DeadlineExceeded(f"no time left to fetch {url}")
+    timeout = REQUEST_TIMEOUT if remaining is None else min(REQUEST_TIMEOUT, remaining)
+    kwargs.setdefault('timeout', timeout)
+    session = get_session()
+    _count_connection('requests')
+    _request_timing.connect = 0.0
+    response = session.get(url, **kwargs)
+    response.timings = {
+        'wait_seconds': waited,
+        'connect_seconds': _request_timing.connect,
+        'response_seconds': response.elapsed.total_seconds(),
+        'total_seconds': time.perf_counter() - start - waited,
+    }
+    return response
+
+def polite_get(url, delay=None, deadline=None, retries=None, circuit=None, **kwargs):
+    """GET a url through the shared session, spacing requests per host.
+
+    All page fetches should go through here so they share pooled
+    keep-alive connections, per-host politeness and circuit breaking.
+    delay overrides HOST_DELAY for this request. Connection errors,
+    timeouts and 429/5xx answers are retried with jittered exponential
+    backoff, up to retries times (MAX_RETRIES by default) and only while
+    the time.monotonic() deadline allows. The response gets a 'timings'
+    dict with the politeness wait, connect, time-to-headers and total
+    seconds of the last attempt, and the number of retries. circuit names
+    the breaker to count failures against, the url's host by default.
+    """
+    circuit = circuit or urlparse(url).netloc
+    breaker = get_breaker()
+    if not breaker.allow(circuit):
+        raise CircuitOpen(f"{circuit} is failing, skipped until its cooldown ends")
     try:
-        response = requests.get(url, headers=HEADERS, timeout=15)
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        event_items = soup.select('article, .post, .event-item, .list-item')
-        
-        for item in event_items[:25]:
-            try:
-                title_elem = item.select_one('h2, h3, .entry-title, .title')
-                link_elem = title_elem.select_one('a') if title_elem else item.select_one('a[href]')
-                
-                if not title_elem or not link_elem:
-                    continue
-                
-                title = title_elem.get_text(strip=True)
-                link = link_elem['href']
-                if not link.startswith('http'):
-                    link = urljoin('https://aarhusliv.dk', link)
-                
-                description_elem = item.select_one('.entry-content, .excerpt, p')
-                description = description_elem.get_text(strip=True)[:300] if description_elem else ""
-                
-                date_elem = item.select_one('.date, .time, .post-date')
-                date_text = date_elem.get_text(strip=True) if date_elem else ""
-                
-                if contains_sustainability_keywords(f"{title} {description}"):
-                    event = {
-                        'title': title,
-                        'description': description,
-                        'date': date_text,
-                        'time': '',
-                        'location': 'Aarhus',
-                        'address': '',
-                        'link': link,
-                        'source': 'aarhusliv.dk',
-                        'category': 'event',
-                        'image': '',
-                        'organizer': '',
-                        'points': 100
-                    }
-                    events.append(event)
-                    
-            except Exception as e:
-                print(f"Error parsing event from aarhusliv: {e}")
-                continue
-                
-    except Exception as e:
-        print(f"Error scraping aarhusliv: {e}")
-    
-    return events
+        return _get_with_retries(url, delay, deadline, retries, circuit, breaker, **kwargs)
+    finally:
+        # a deadline or an unexpected error is no verdict on the host
+        breaker.end_trial(circuit)
 
-def scrape_aarhusevents():
-    """Scrape events from aarhusevents.dk"""
-    events = []
-    url = "https://aarhusevents.dk/"
-    
+def _get_with_retries(url, delay, deadline, retries, circuit, breaker, **kwargs):
+    retries = MAX_RETRIES if retries is None else retries
+    attempt = 0
+    while True:
+        error = response = None
+        try:
+            response = _get_once(url, delay, deadline, **kwargs)
+        except DeadlineExceeded:
+            # no time left to even send the request: no verdict on the host
+            raise
+        except (requests.ConnectionError, requests.Timeout) as e:
+            remaining = _remaining(deadline)
+            if remaining is not None and remaining <= 0:
+                # the attempt was sent and failed, so it still counts against the host
+                breaker.record_failure(circuit)
+                raise DeadlineExceeded(f"ran out of time fetching {url}") from e
+            error = e
+        else:
+            response.timings['retries'] = attempt
+            if response.status_code not in RETRY_STATUSES:
+                breaker.record_success(circuit)
+                return response
+
+        pause = _retry_delay(attempt, response)
+        remaining = _remaining(deadline)
+        if attempt >= retries or (remaining is not None and pause >= remaining):
+            breaker.record_failure(circuit)
+            if error is not None:
+                raise error
+            return response
+        if response is not None:
+            response.close()
+        attempt += 1
+        time.sleep(pause)
+
+# Per-source, per-stage counters for the run report. Stages that work on
+# all events at once are recorded under the source name 'all'.
+_metrics = {}
+_metrics_guard = threading.Lock()
+
+def record_metric(source, stage, **values):
+    """Add values to the counters of one source and stage."""
+    with _metrics_guard:
+        stats = _metrics.setdefault(source, {}).setdefault(stage, {})
+        for name, value in values.items():
+            stats[name] = stats.get(name, 0) + value
+
+def reset_metrics():
+    """Start a new run: clear the stage counters and the cache, stream and connection stats."""
+    with _metrics_guard:
+        _metrics.clear()
+    with _cache_stats_guard:
+        _cache_stats.clear()
+    with _stream_stats_guard:
+        _stream_stats.clear()
+    with _connection_counts_guard:
+        _connection_counts.update(requests=0, connections=0)
+
+def run_metrics():
+    """Return a copy of the counters as {source: {stage: {name: value}}}."""
+    with _metrics_guard:
+        return {source: {stage: dict(values) for stage, values in stages.items()}
+                for source, stages in _metrics.items()}
+
+def _trie_pattern(words):
+    """Build a regex matching any of words, factored as a prefix trie.
+
+    The trie shape lets the regex engine reject a position after looking at
+    a few characters instead of trying every keyword in turn, and optional
+    suffixes are greedy so the longest keyword at a position wins.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node):
+        branches = [re.escape(char) + build(child)
+                    for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        pattern = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        return f"(?:{pattern})?" if '' in node else pattern
+
+    return build(trie)
+
+class KeywordMatcher:
+    """Match a fixed set of keywords against text in a single regex pass.
+
+    Keywords are matched as case-insensitive substrings, like the original
+    linear scan. Positions refer to the lowercased text.
+    """
+
+    def __init__(self, keywords):
+        self.keywords = sorted({keyword.lower() for keyword in keywords})
+        pattern = _trie_pattern(self.keywords)
+        self._search = re.compile(pattern)
+        # The lookahead lets matches overlap, so 'grøn' inside 'bæredygtig
+        # grøn' is found as well as the longer keyword around it.
+        self._scan = re.compile(f"(?=({pattern}))")
+        # The regex reports only the longest keyword starting at a position;
+        # shorter keywords that are prefixes of it start there too.
+        self._prefixes = {
+            keyword: [other for other in self.keywords
+                      if other != keyword and keyword.startswith(other)]
+            for keyword in self.keywords
+        }
+
+    def search(self, text):
+        """Return True if any keyword occurs in text."""
+        return bool(text) and self._search.search(text.lower()) is not None
+
+    def find_all(self, text):
+        """Return (keyword, position) for every keyword occurrence in text."""
+        if not text:
+            return []
+        matches = []
+        for match in self._scan.finditer(text.lower()):
+            keyword = match.group(1)
+            start = match.start()
+            matches.append((keyword, start))
+            matches.extend((prefix, start) for prefix in self._prefixes[keyword])
+        return matches
+
+    def matched_keywords(self, text):
+        """Return the distinct keywords found in text, in order of first match."""
+        return list(dict.fromkeys(keyword for keyword, _ in self.find_all(text)))
+
+SUSTAINABILITY_MATCHER = KeywordMatcher(SUSTAINABILITY_KEYWORDS)
+
+def contains_sustainability_keywords(text):
+    """Check if text contains sustainability keywords."""
+    return SUSTAINABILITY_MATCHER.search(text)
+
+CATEGORY_KEYWORDS = {
+    'cleaning': ['renhold', 'oprydning', 'clean-up', 'skrald', 'affald', 'plastik'],
+    'food': ['madspild', 'madlavning', 'fødevare', 'spise', 'måltid', 'fællesspisning'],
+    'repair': ['repair', 'reparation', 'fix', 'istandsættelse'],
+    'workshop': ['workshop', 'kursus', 'læring', 'undervisning', 'foredrag'],
+    'gardening': ['have', 'plante', 'dyrkning', 'gartneri', 'grøntsag', 'frugt'],
+    'transport': ['cykel', 'transport', 'mobilitet', 'elbil', 'løb', 'vandring'],
+    'energy': ['energi', 'besparelse', 'solcelle', 'vindmølle', 'co2'],
+    'community': ['fællesskab', 'forening', 'frivillig', 'samfund', 'community'],
+    'swap': ['swap', 'bytte', 'genbrugsmarked', 'loppemarked'],
+    'climate': ['klima', 'klimahuset', 'co2', 'opvarmning'],
+    'creative': ['kunst', 'design', 'kreativ', 'håndværk']
+}
+
+class EventClassifier:
+    """Decide relevance and categories for a text from one keyword pass.
+
+    Sustainability and category keywords share a single KeywordMatcher; each
+    matched keyword is then looked up in a precomputed table of what it
+    means, so adding categories does not add passes over the text.
+    """
+
+    def __init__(self, sustainability_keywords, category_keywords):
+        all_keywords = list(sustainability_keywords)
+        for keywords in category_keywords.values():
+            all_keywords.extend(keywords)
+        self.matcher = KeywordMatcher(all_keywords)
+        self.category_order = list(category_keywords)
+
+        sustainability = {keyword.lower() for keyword in sustainability_keywords}
+        self._meaning = {}
+        for keyword in self.matcher.keywords:
+            categories = frozenset(category for category, keywords in category_keywords.items()
+                                   if keyword in keywords)
+            self._meaning[keyword] = (keyword in sustainability, categories)
+
+    def classify(self, text):
+        """Return (relevant, matched sustainability keywords, categories)."""
+        matched = []
+        found_categories = set()
+        for keyword in self.matcher.matched_keywords(text):
+            is_sustainability, categories = self._meaning[keyword]
+            if is_sustainability:
+                matched.append(keyword)
+            found_categories.update(categories)
+
+        categories = [category for category in self.category_order
+                      if category in found_categories]
+        # Add sustainability as default if no specific category found
+        if not categories:
+            categories.append('sustainability')
+        return bool(matched), matched, categories
+
+EVENT_CLASSIFIER = EventClassifier(SUSTAINABILITY_KEYWORDS, CATEGORY_KEYWORDS)
+
+def classify_events(events, require_relevance=True):
+    """Filter and categorize a batch of events in one pass per event.
+
+    Sets 'categories' and 'matched_keywords' on every event and returns the
+    ones containing sustainability keywords, or all of them when
+    require_relevance is False.
+    """
+    classified = []
+    for event in events:
+        relevant, keywords, categories = EVENT_CLASSIFIER.classify(
+            f"{event['title']} {event['description']}")
+        event['matched_keywords'] = keywords
+        event['categories'] = categories
+        if relevant or not require_relevance:
+            classified.append(event)
+    return classified
+
+# Persistent response cache for source listing pages
+CACHE_DIR = '.scraper_cache'
+# Bump when extraction changes so cached events are not reused
+CACHE_VERSION = 3
+
+_cache_stats = {}
+_cache_stats_guard = threading.Lock()
+
+def configure_cache(cache_dir=CACHE_DIR):
+    """Set the response cache directory; None disables caching."""
+    global CACHE_DIR
+    CACHE_DIR = cache_dir
+    with _cache_stats_guard:
+        _cache_stats.clear()
+
+def _cache_path(source):
+    return os.path.join(CACHE_DIR, f"{source}.json")
+
+def _load_cache_entry(source):
+    if not CACHE_DIR:
+        return None
     try:
-        response = requests.get(url, headers=HEADERS, timeout=15)
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        event_items = soup.select('.event, .arrangement, article, .item')
-        
-        for item in event_items[:25]:
-            try:
-                title_elem = item.select_one('h2, h3, .title, .event-title')
-                link_elem = item.select_one('a[href]')
-                
-                if not title_elem or not link_elem:
-                    continue
-                
-                title = title_elem.get_text(strip=True)
-                link = link_elem['href']
-                if not link.startswith('http'):
-                    link = urljoin('https://aarhusevents.dk', link)
-                
-                description_elem = item.select_one('.description, .excerpt, .content')
-                description = description_elem.get_text(strip=True)[:300] if description_elem else ""
-                
-                date_elem = item.select_one('.date, .event-date')
-                date_text = date_elem.get_text(strip=True) if date_elem else ""
-                
-                location_elem = item.select_one('.location, .venue')
-                location = location_elem.get_text(strip=True) if location_elem else "Aarhus"
-                
-                if contains_sustainability_keywords(f"{title} {description}"):
-                    event = {
-                        'title': title,
-                        'description': description,
-                        'date': date_text,
-                        'time': '',
-                        'location': location,
-                        'address': location,
-                        'link': link,
-                        'source': 'aarhusevents.dk',
-                        'category': 'event',
-                        'image': '',
-                        'organizer': '',
-                        'points': 100
-                    }
-                    events.append(event)
-                    
-            except Exception as e:
-                print(f"Error parsing event from aarhusevents: {e}")
-                continue
-                
-    except Exception as e:
-        print(f"Error scraping aarhusevents: {e}")
-    
+        with open(_cache_path(source), encoding='utf-8') as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return entry if entry.get('version') == CACHE_VERSION else None
+
+def _save_cache_entry(source, entry):
+    if not CACHE_DIR:
+        return
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    path = _cache_path(source)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(entry, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+def _record_cache_result(source, hit):
+    with _cache_stats_guard:
+        stats = _cache_stats.setdefault(source, {'hits': 0, 'misses': 0})
+        stats['hits' if hit else 'misses'] += 1
+
+def cache_stats():
+    """Return cache hits, misses and hit ratio per source for this process."""
+    with _cache_stats_guard:
+        stats = {source: dict(counts) for source, counts in _cache_stats.items()}
+    for counts in stats.values():
+        total = counts['hits'] + counts['misses']
+        counts['hit_ratio'] = counts['hits'] / total if total else 0.0
+    return stats
+
+class SourcePage:
+    """A fetched listing page, or the cached events if it has not changed.
+
+    Streamed pages carry the open response instead of their content.
+    """
+
+    def __init__(self, source, content=None, cached_events=None, entry=None, response=None):
+        self.source = source
+        self.content = content
+        self.cached_events = cached_events
+        self.entry = entry
+        self.response = response
+
+    @property
+    def unchanged(self):
+        return self.cached_events is not None
+
+    def remember(self, events):
+        """Store the events extracted from this page for the next run."""
+        if self.entry is not None:
+            self.entry['events'] = events
+            _save_cache_entry(self.source, self.entry)
+        return events
+
+def _record_fetch(source, response, body_bytes):
+    timings = response.timings
+    record_metric(source, 'fetch', requests=1, bytes=body_bytes, retries=timings['retries'],
+                  wait_seconds=timings['wait_seconds'],
+                  connect_seconds=timings['connect_seconds'],
+                  response_seconds=timings['response_seconds'],
+                  download_seconds=max(0.0, timings['total_seconds'] - timings['response_seconds']),
+                  not_modified=int(response.status_code == 304),
+                  http_errors=int(response.status_code >= 400))
+
+def fetch_source_page(source, url, stream=False, deadline=None):
+    """Fetch a source's listing page with a conditional GET.
+
+    When the server answers 304 Not Modified, or the body hashes the same as
+    last run, the returned page carries the previously extracted events so
+    the caller can skip parsing. With stream=True a 200 response is returned
+    unread, so it is only revalidated by ETag/Last-Modified. Any other status
+    raises requests.HTTPError.
+    """
+    entry = _load_cache_entry(source)
+    if entry and entry.get('url') != url:
+        entry = None
+
+    headers = {}
+    if entry and entry.get('etag'):
+        headers['If-None-Match'] = entry['etag']
+    if entry and entry.get('last_modified'):
+        headers['If-Modified-Since'] = entry['last_modified']
+
+    response = polite_get(url, deadline=deadline, headers=headers, stream=stream)
+    _record_fetch(source, response, 0 if stream else len(response.content))
+    if response.status_code == 304 and entry:
+        response.close()
+        _record_cache_result(source, True)
+        return SourcePage(source, cached_events=entry['events'])
+
+    if response.status_code != 200:
+        # An error page has no events; parsing it would empty the source in the store
+        response.close()
+        _record_cache_result(source, False)
+        raise requests.HTTPError(f"{response.status_code} from {url}", response=response)
+
+    new_entry = {
+        'version': CACHE_VERSION,
+        'url': url,
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified'),
+        'body_hash': None if stream else hashlib.sha256(response.content).hexdigest(),
+        'fetched_at': datetime.now().isoformat(),
+    }
+    if stream:
+        _record_cache_result(source, False)
+        return SourcePage(source, entry=new_entry, response=response)
+    if entry and entry.get('body_hash') == new_entry['body_hash']:
+        _record_cache_result(source, True)
+        page = SourcePage(source, cached_events=entry['events'], entry=new_entry)
+        page.remember(entry['events'])
+        return page
+
+    _record_cache_result(source, False)
+    return SourcePage(source, content=response.content, entry=new_entry)
+
+# Persistent store of every event seen, so runs only process what changed
+STORE_PATH = 'aarhus_sustainability_events.sqlite'
+EVENT_STORE = None
+
+# Fields added by classification; they are not part of an event's content
+CLASSIFICATION_FIELDS = ('categories', 'matched_keywords')
+
+def event_key(event):
+    """Identify an event by its link, or by source and title for placeholder links."""
+    link = event.get('link') or ''
+    if link in ('', '#'):
+        return f"{event['source']}:{event['title'].strip().lower()}"
+    return link
+
+def event_content_hash(event):
+    """Hash the scraped content of an event, ignoring classification results."""
+    content = {field: value for field, value in event.items()
+               if field not in CLASSIFICATION_FIELDS}
+    encoded = json.dumps(content, sort_keys=True, ensure_ascii=False).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+class EventStore:
+    """SQLite store of every candidate event, keyed by source and event_key().
+
+    Each row keeps the content hash, the relevance verdict and the processed
+    event, so unchanged events are reused instead of classified again. A run
+    collects a diff of relevant events that were added, changed or removed.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS events (
+            source TEXT NOT NULL,
+            key TEXT NOT NULL,
+            content_hash TEXT NOT NULL,
+            relevant INTEGER NOT NULL,
+            event TEXT NOT NULL,
+            first_seen TEXT NOT NULL,
+            last_seen TEXT NOT NULL,
+            run_id INTEGER NOT NULL,
+            PRIMARY KEY (source, key)
+        );
+        CREATE TABLE IF NOT EXISTS runs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            started TEXT NOT NULL
+        );
+    """
+
+    def __init__(self, path=STORE_PATH):
+        self.path = path
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript(self.SCHEMA)
+        self._lock = threading.Lock()
+        self.run_id = None
+        self.diff = {'added': [], 'changed': [], 'removed': []}
+        self._sources_seen = set()
+
+    def close(self):
+        self._db.close()
+
+    def begin_run(self):
+        """Start a run; events not seen again by its end count as removed."""
+        with self._lock, self._db:
+            cursor = self._db.execute("INSERT INTO runs (started) VALUES (?)",
+                                      (datetime.now().isoformat(),))
+            self.run_id = cursor.lastrowid
+            self.diff = {'added': [], 'changed': [], 'removed': []}
+            self._sources_seen = set()
+
+    def _stored(self, source, keys):
+        stored = {}
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            rows = self._db.execute(
+                f"SELECT key, content_hash, relevant, event FROM events "
+                f"WHERE source = ? AND key IN ({placeholders})", [source, *chunk])
+            for key, content_hash, relevant, event in rows:
+                stored[key] = (content_hash, bool(relevant), json.loads(event))
+        return stored
+
+    def _record_change(self, old, relevant, event):
+        was_relevant = old is not None and old[1]
+        if relevant and not was_relevant:
+            self.diff['added'].append(event)
+        elif relevant:
+            self.diff['changed'].append(event)
+        elif was_relevant:
+            self.diff['removed'].append(old[2])
+
+    def classify(self, source, candidates, require_relevance=True):
+        """Classify only new or changed candidates and upsert all of them.
+
+        Returns the relevant events, reusing the stored result for every
+        candidate whose content hash has not changed.
+        """
+        keyed = [(event_key(event), event_content_hash(event), event) for event in candidates]
+        with self._lock:
+            stored = self._stored(source, [key for key, _, _ in keyed])
+
+        fresh = [event for key, content_hash, event in keyed
+                 if stored.get(key, (None,))[0] != content_hash
+                 and 'matched_keywords' not in event]
+        # Pages parsed in a worker process arrive already classified
+        classify_events(fresh, require_relevance=False)
+
+        now = datetime.now().isoformat()
+        relevant_events = []
+        rows = []
+        with self._lock:
+            for key, content_hash, event in keyed:
+                old = stored.get(key)
+                if old is not None and old[0] == content_hash:
+                    relevant, event = old[1], old[2]
+                else:
+                    relevant = bool(event['matched_keywords']) or not require_relevance
+                    self._record_change(old, relevant, event)
+                rows.append((source, key, content_hash, int(relevant),
+                             json.dumps(event, ensure_ascii=False), now, now, self.run_id))
+                if relevant:
+                    relevant_events.append(event)
+
+            with self._db:
+                self._db.executemany(
+                    "INSERT INTO events (source, key, content_hash, relevant, event, "
+                    "first_seen, last_seen, run_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (source, key) DO UPDATE SET "
+                    "content_hash = excluded.content_hash, relevant = excluded.relevant, "
+                    "event = excluded.event, last_seen = excluded.last_seen, "
+                    "run_id = excluded.run_id", rows)
+            self._sources_seen.add(source)
+        return relevant_events
+
+    def touch_source(self, source):
+        """Mark every stored event of a source whose page did not change as seen."""
+        with self._lock, self._db:
+            self._db.execute("UPDATE events SET run_id = ?, last_seen = ? WHERE source = ?",
+                             (self.run_id, datetime.now().isoformat(), source))
+            self._sources_seen.add(source)
+
+    def finish_run(self):
+        """Drop events that disappeared from sources fetched this run; return the diff.
+
+        Sources that failed to fetch are left alone, so an outage does not
+        look like every one of their events being removed.
+        """
+        with self._lock, self._db:
+            for source in self._sources_seen:
+                rows = self._db.execute(
+                    "SELECT relevant, event FROM events WHERE source = ? AND run_id != ?",
+                    (source, self.run_id)).fetchall()
+                self.diff['removed'].extend(json.loads(event) for relevant, event in rows if relevant)
+                self._db.execute("DELETE FROM events WHERE source = ? AND run_id != ?",
+                                 (source, self.run_id))
+        return self.diff
+
+def configure_store(path=STORE_PATH):
+    """Open the event store at path; None disables incremental runs."""
+    global EVENT_STORE
+    if EVENT_STORE is not None:
+        EVENT_STORE.close()
+    EVENT_STORE = EventStore(path) if path else None
+    return EVENT_STORE
+
+def classify_source_events(source, candidates):
+    """Classify a source's candidates, reusing stored results when a store is open."""
+    require_relevance = source.get('filter', True)
+    start = time.perf_counter()
+    if EVENT_STORE is not None:
+        events = EVENT_STORE.classify(source['name'], candidates, require_relevance)
+    else:
+        # Pages parsed in a worker process arrive already classified
+        classify_events([event for event in candidates if 'matched_keywords' not in event],
+                        require_relevance=False)
+        events = [event for event in candidates if event['matched_keywords'] or not require_relevance]
+    record_metric(source['name'], 'classify', candidates=len(candidates), relevant=len(events),
+                  seconds=time.perf_counter() - start)
     return events
 
-def scrape_aarhusinside():
-    """Scrape events from aarhusinside.dk"""
+# Regions covered by the catalogue; 'city' is the default event location
+DEFAULT_REGION = 'aarhus'
+REGIONS = {
+    'aarhus': {'city': 'Aarhus'},
+}
+
+def region_city(region):
+    return REGIONS.get(region or DEFAULT_REGION, {}).get('city', REGIONS[DEFAULT_REGION]['city'])
+
+# Registry of event sources. Each entry is run by scrape_source():
+#   region        key into REGIONS; each region gets its own output
+#   items         CSS selector for the listing items, capped at 'limit'
+#   title, description, date, location
+#                 CSS selectors searched inside each item (None to skip)
+#   link_in_title take the link from inside the title element
+#   defaults      values used when a field's selector finds nothing
+#   address       fixed address, or 'location' to copy the location
+#   filter        only keep events containing sustainability keywords
+#   container     optional simple selector for the element holding the listing
+SOURCES = [
+    {
+        'name': 'migogaarhus.dk',
+        'region': 'aarhus',
+        'url': 'https://migogaarhus.dk/kalender/',
+        'items': 'article, .event-item, .post, .item',
+        'limit': 20,
+        'title': 'h2, h3, .title, .event-title',
+        'description': '.description, .excerpt, .content, p',
+        'date': '.date, .event-date, .post-date, time',
+        'location': '.location, .venue, .place',
+        'address': 'location',
+        'category': 'event',
+    },
+    {
+        'name': 'tipaarhus.dk',
+        'region': 'aarhus',
+        'url': 'https://tipaarhus.dk/det-sker-i-aarhus/',
+        'items': 'article, .post, .event, .arrangement',
+        'limit': 20,
+        'title': 'h2, h3, .entry-title, .title',
+        'link_in_title': True,
+        'description': '.entry-content, .excerpt, .description',
+        'date': '.date, .post-date, .event-date',
+        'location': '.location, .venue',
+        'address': 'location',
+        'category': 'event',
+    },
+    {
+        'name': 'visitaarhus.dk',
+        'region': 'aarhus',
+        'url': 'https://www.visitaarhus.dk/aarhusregionen/baeredygtighed-i-fokus',
+        'items': 'article, .content-item, .news-item, .card',
+        'limit': 15,
+        'title': 'h2, h3, h4, .title',
+        'description': 'p, .description, .text',
+        'defaults': {'date': 'Se link for dato', 'location': 'Aarhus region'},
+        'category': 'sustainability',
+    },
+    {
+        'name': 'aarhusliv.dk',
+        'region': 'aarhus',
+        'url': 'https://aarhusliv.dk/det-sker-i-aarhus/',
+        'items': 'article, .post, .event-item, .list-item',
+        'limit': 25,
+        'title': 'h2, h3, .entry-title, .title',
+        'link_in_title': True,
+        'description': '.entry-content, .excerpt, p',
+        'date': '.date, .time, .post-date',
+        'category': 'event',
+    },
+    {
+        'name': 'aarhusevents.dk',
+        'region': 'aarhus',
+        'url': 'https://aarhusevents.dk/',
+        'items': '.event, .arrangement, article, .item',
+        'limit': 25,
+        'title': 'h2, h3, .title, .event-title',
+        'description': '.description, .excerpt, .content',
+        'date': '.date, .event-date',
+        'location': '.location, .venue',
+        'address': 'location',
+        'category': 'event',
+    },
+    {
+        'name': 'aarhusinside.dk',
+        'region': 'aarhus',
+        'url': 'https://aarhusinside.dk/oplevelser-i-aarhus/',
+        'items': 'article, .post, .experience-item, .listing',
+        'limit': 25,
+        'title': 'h2, h3, .entry-title, .title',
+        'link_in_title': True,
+        'description': '.entry-content, .excerpt, .description',
+        'date': '.date, .post-date',
+        'category': 'experience',
+    },
+    {
+        'name': 'domen.aarhus.dk',
+        'region': 'aarhus',
+        'url': 'https://domen.aarhus.dk/',
+        'items': '.event, .arrangement, .activity, .item',
+        'limit': 20,
+        'title': 'h2, h3, .title, .event-title',
+        'description': '.description, .summary, p',
+        'date': '.date, .time',
+        'location': '.location, .place',
+        'category': 'municipal',
+        'organizer': 'Aarhus Kommune',
+    },
+    {
+        'name': 'klimahusetaarhus.dk',
+        'region': 'aarhus',
+        'url': 'https://klimahusetaarhus.dk/arrangementer/',
+        'items': 'article, .event, .arrangement, .post',
+        'limit': 20,
+        'title': 'h2, h3, .entry-title',
+        'link_in_title': True,
+        'description': '.entry-content, .description, p',
+        'date': '.date, .event-date',
+        'defaults': {'date': 'Kommer snart', 'location': 'Klimahuset Aarhus'},
+        'address': 'Magistrsparken 2, 8000 Aarhus C',
+        'category': 'climate',
+        'organizer': 'Klimahuset Aarhus',
+        # All Klimahuset events are sustainability-related
+        'filter': False,
+    },
+    {
+        'name': 'godsbanen.dk',
+        'region': 'aarhus',
+        'url': 'https://godsbanen.dk/arrangementer',
+        'items': '.event, .arrangement, article, .post',
+        'limit': 25,
+        'title': 'h2, h3, .event-title',
+        'description': '.description, .excerpt, p',
+        'date': '.date, .event-date',
+        'defaults': {'date': 'Aktiviteter', 'location': 'Godsbanen'},
+        'address': 'Skovgaardsgade 3, 8000 Aarhus C',
+        'category': 'creative',
+        'organizer': 'Godsbanen',
+    },
+]
+
+SOURCE_REGISTRY = {source['name']: source for source in SOURCES}
+
+CATALOGUE_FIELDS = ('name', 'region', 'url', 'items', 'title')
+
+def load_catalogue(path):
+    """Read regions and sources from a JSON catalogue.
+
+    The file holds {"regions": {key: {"city": ...}}, "sources": [...]},
+    with sources in the same shape as SOURCES. Returns the sources and
+    adds the regions to REGIONS.
+    """
+    with open(path, encoding='utf-8') as f:
+        catalogue = json.load(f)
+    REGIONS.update(catalogue.get('regions', {}))
+    sources = catalogue.get('sources', [])
+    for source in sources:
+        missing = [field for field in CATALOGUE_FIELDS if not source.get(field)]
+        if missing:
+            raise ValueError(f"catalogue source {source.get('name', '?')} lacks {', '.join(missing)}")
+        if source['region'] not in REGIONS:
+            raise ValueError(f"catalogue source {source['name']} has unknown region {source['region']}")
+        source.setdefault('limit', 20)
+        source.setdefault('category', 'event')
+    return sources
+
+def configure_catalogue(path=None, regions=None):
+    """Replace the built-in sources with a catalogue file and/or keep only some regions."""
+    global SOURCES, SOURCE_REGISTRY
+    sources = load_catalogue(path) if path else SOURCES
+    if regions:
+        sources = [source for source in sources if source.get('region', DEFAULT_REGION) in regions]
+    SOURCES = sources
+    SOURCE_REGISTRY = {source['name']: source for source in SOURCES}
+    return SOURCES
+
+@functools.lru_cache(maxsize=None)
+def compile_selector(selector):
+    """Compile a CSS selector once; later calls reuse the compiled matcher."""
+    return soupsieve.compile(selector)
+
+def _select_text(item, selector, default=""):
+    if not selector:
+        return default
+    elem = compile_selector(selector).select_one(item)
+    return elem.get_text(strip=True) if elem else default
+
+def configure_parser(backend=None, subtree=True, stream=False):
+    """Choose the HTML parser backend, subtree-only parsing and streaming."""
+    global PARSER_BACKEND, PARSE_SUBTREE, STREAM_LISTINGS
+    if backend:
+        PARSER_BACKEND = backend
+    PARSE_SUBTREE = subtree
+    STREAM_LISTINGS = stream
+
+_SIMPLE_SELECTOR = re.compile(r'^(?:([a-zA-Z][\w-]*)|\.([\w-]+))$')
+
+class ListingStrainer(SoupStrainer):
+    """Only build elements matching simple tag or class selectors.
+
+    Everything inside a matching element is kept, so selecting on the
+    strained tree finds the same items as on the full page while headers,
+    footers and scripts are never turned into Tag objects.
+    """
+
+    def __init__(self, tags, classes):
+        self.tags = frozenset(tags)
+        self.classes = frozenset(classes)
+        super().__init__(name=self._matches)
+
+    def _matches(self, name, attrs=None):
+        if name in self.tags:
+            return True
+        classes = (attrs or {}).get('class') or ()
+        if isinstance(classes, str):
+            classes = classes.split()
+        return not self.classes.isdisjoint(classes)
+
+    def allow_tag_creation(self, nsprefix, name, attrs):
+        # beautifulsoup4 >= 4.13 asks this instead of calling the name filter
+        return self._matches(name, attrs)
+
+@functools.lru_cache(maxsize=None)
+def listing_strainer(selector):
+    """Build a ListingStrainer for a selector list, or None if it is not simple."""
+    tags, classes = [], []
+    for part in selector.split(','):
+        match = _SIMPLE_SELECTOR.match(part.strip())
+        if not match:
+            return None
+        if match.group(1):
+            tags.append(match.group(1).lower())
+        else:
+            classes.append(match.group(2))
+    return ListingStrainer(tags, classes)
+
+def parse_listing(source, content, backend=None, subtree=None):
+    """Parse a listing page, optionally building only the listing subtrees.
+
+    A source may set 'container' to a simple selector for the element that
+    holds its listing; otherwise its item selector is used.
+    """
+    backend = backend or PARSER_BACKEND
+    subtree = PARSE_SUBTREE if subtree is None else subtree
+    strainer = listing_strainer(source.get('container', source['items'])) if subtree else None
+    return BeautifulSoup(content, backend, parse_only=strainer)
+
+def extract_item(source, item):
+    """Build an event dict from one listing item, or None if it has no title/link."""
+    title_elem = compile_selector(source['title']).select_one(item)
+    if source.get('link_in_title') and title_elem:
+        link_elem = compile_selector('a').select_one(title_elem)
+    else:
+        link_elem = compile_selector('a[href]').select_one(item)
+
+    if not title_elem or not link_elem or not link_elem.get('href'):
+        return None
+
+    link = link_elem['href']
+    if not link.startswith('http'):
+        site = urlparse(source['url'])
+        link = urljoin(f"{site.scheme}://{site.netloc}", link)
+
+    defaults = source.get('defaults', {})
+    description = _select_text(item, source.get('description'))[:300]
+    date_text = _select_text(item, source.get('date'), defaults.get('date', ''))
+    region = source.get('region', DEFAULT_REGION)
+    location = _select_text(item, source.get('location'), defaults.get('location', region_city(region)))
+    address = source.get('address', '')
+    if address == 'location':
+        address = location
+
+    return {
+        'title': title_elem.get_text(strip=True),
+        'description': description,
+        'date': date_text,
+        'time': '',
+        'location': location,
+        'address': address,
+        'link': link,
+        'source': source['name'],
+        'category': source['category'],
+        'image': '',
+        'organizer': source.get('organizer', ''),
+        'points': 100,
+        'region': region
+    }
+
+def _extract_items(source, items):
     events = []
-    url = "https://aarhusinside.dk/oplevelser-i-aarhus/"
-    
-    try:
-        response = requests.get(url, headers=HEADERS, timeout=15)
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        event_items = soup.select('article, .post, .experience-item, .listing')
-        
-        for item in event_items[:25]:
-            try:
-                title_elem = item.select_one('h2, h3, .entry-title, .title')
-                link_elem = title_elem.select_one('a') if title_elem else item.select_one('a[href]')
-                
-                if not title_elem or not link_elem:
-                    continue
-                
-                title = title_elem.get_text(strip=True)
-                link = link_elem['href']
-                if not link.startswith('http'):
-                    link = urljoin('https://aarhusinside.dk', link)
-                
-                description_elem = item.select_one('.entry-content, .excerpt, .description')
-                description = description_elem.get_text(strip=True)[:300] if description_elem else ""
-                
-                date_elem = item.select_one('.date, .post-date')
-                date_text = date_elem.get_text(strip=True) if date_elem else ""
-                
-                if contains_sustainability_keywords(f"{title} {description}"):
-                    event = {
-                        'title': title,
-                        'description': description,
-                        'date': date_text,
-                        'time': '',
-                        'location': 'Aarhus',
-                        'address': '',
-                        'link': link,
-                        'source': 'aarhusinside.dk',
-                        'category': 'experience',
-                        'image': '',
-                        'organizer': '',
-                        'points': 100
-                    }
-                    events.append(event)
-                    
-            except Exception as e:
-                print(f"Error parsing event from aarhusinside: {e}")
-                continue
-                
-    except Exception as e:
-        print(f"Error scraping aarhusinside: {e}")
-    
+    errors = 0
+    start = time.perf_counter()
+    for item in items:
+        try:
+            event = extract_item(source, item)
+        except Exception as e:
+            print(f"Error parsing event from {source['name']}: {e}")
+            errors += 1
+            continue
+        if event:
+            events.append(event)
+
+    record_metric(source['name'], 'extract', items=len(items), events=len(events),
+                  errors=errors, seconds=time.perf_counter() - start)
     return events
 
-def scrape_domen_aarhus():
-    """Scrape events from domen.aarhus.dk (Aarhus Kommune)"""
-    events = []
-    url = "https://domen.aarhus.dk/"
-    
+def extract_events(source, soup):
+    """Run a source's precompiled selectors over a parsed listing page."""
+    items = compile_selector(source['items']).select(soup, limit=source['limit'])
+    return _extract_items(source, items)
+
+class ListingItemScanner(HTMLParser):
+    """Find complete listing items in HTML fed to it piece by piece.
+
+    Only the outermost elements accepted by a ListingStrainer are tracked;
+    feed() returns the source text of every such element that closed.
+    """
+
+    def __init__(self, strainer):
+        super().__init__(convert_charrefs=False)
+        self.strainer = strainer
+        self.text = ''
+        self._line_starts = [0]
+        self._item_start = None
+        self._item_tag = None
+        self._depth = 0
+        self._completed = []
+
+    def _offset(self):
+        lineno, column = self.getpos()
+        return self._line_starts[lineno - 1] + column
+
+    def feed(self, data):
+        base = len(self.text)
+        self.text += data
+        newline = data.find('\n')
+        while newline != -1:
+            self._line_starts.append(base + newline + 1)
+            newline = data.find('\n', newline + 1)
+        super().feed(data)
+        completed, self._completed = self._completed, []
+        return completed
+
+    def close(self):
+        super().close()
+        completed, self._completed = self._completed, []
+        if self._item_start is not None:
+            # The page ended inside an item; hand over what we have
+            completed.append(self.text[self._item_start:])
+            self._item_start = None
+        return completed
+
+    def handle_starttag(self, tag, attrs):
+        if self._item_start is None:
+            if self.strainer._matches(tag, dict(attrs)):
+                self._item_start = self._offset()
+                self._item_tag = tag
+                self._depth = 1
+        elif tag == self._item_tag:
+            self._depth += 1
+
+    def handle_startendtag(self, tag, attrs):
+        if self._item_start is None and self.strainer._matches(tag, dict(attrs)):
+            start = self._offset()
+            end = self.text.find('>', start) + 1
+            self._completed.append(self.text[start:end])
+
+    def handle_endtag(self, tag):
+        if self._item_start is None or tag != self._item_tag:
+            return
+        self._depth -= 1
+        if self._depth == 0:
+            end = self.text.find('>', self._offset()) + 1
+            self._completed.append(self.text[self._item_start:end])
+            self._item_start = None
+            # Everything before a completed item is no longer needed
+            self.text = self.text[end:]
+            self._line_starts = [start - end for start in self._line_starts]
+
+_stream_stats = {}
+_stream_stats_guard = threading.Lock()
+
+def _response_decoder(response):
+    # requests assumes ISO-8859-1 for text/html without a charset, but the
+    # pages we scrape are UTF-8 unless they say otherwise.
+    content_type = response.headers.get('Content-Type', '')
+    encoding = response.encoding if 'charset' in content_type.lower() else 'utf-8'
     try:
-        response = requests.get(url, headers=HEADERS, timeout=15)
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Try to find event listings - this site might have a specific structure
-        event_items = soup.select('.event, .arrangement, .activity, .item')
-        
-        for item in event_items[:20]:
-            try:
-                title_elem = item.select_one('h2, h3, .title, .event-title')
-                link_elem = item.select_one('a[href]')
-                
-                if not title_elem or not link_elem:
-                    continue
-                
-                title = title_elem.get_text(strip=True)
-                link = link_elem['href']
-                if not link.startswith('http'):
-                    link = urljoin('https://domen.aarhus.dk', link)
-                
-                description_elem = item.select_one('.description, .summary, p')
-                description = description_elem.get_text(strip=True)[:300] if description_elem else ""
-                
-                date_elem = item.select_one('.date, .time')
-                date_text = date_elem.get_text(strip=True) if date_elem else ""
-                
-                location_elem = item.select_one('.location, .place')
-                location = location_elem.get_text(strip=True) if location_elem else "Aarhus"
-                
-                if contains_sustainability_keywords(f"{title} {description}"):
-                    event = {
-                        'title': title,
-                        'description': description,
-                        'date': date_text,
-                        'time': '',
-                        'location': location,
-                        'address': '',
-                        'link': link,
-                        'source': 'domen.aarhus.dk',
-                        'category': 'municipal',
-                        'image': '',
-                        'organizer': 'Aarhus Kommune',
-                        'points': 100
-                    }
-                    events.append(event)
-                    
-            except Exception as e:
-                print(f"Error parsing event from domen.aarhus: {e}")
-                continue
-                
-    except Exception as e:
-        print(f"Error scraping domen.aarhus: {e}")
-    
-    return events
+        return codecs.getincrementaldecoder(encoding)(errors='replace')
+    except LookupError:
+        return codecs.getincrementaldecoder('utf-8')(errors='replace')
+
+def stream_events(source, response):
+    """Yield a source's events while its listing page is still downloading.
+
+    Each listing item is parsed as soon as its closing tag arrives, and the
+    response is closed once the source's item cap is reached, so the rest of
+    the page is never downloaded.
+    """
+    start = time.monotonic()
+    scanner = ListingItemScanner(listing_strainer(source['items']))
+    decoder = _response_decoder(response)
+    selector = compile_selector(source['items'])
+    seen = 0
+    first_event = None
+    stopped_early = False
+
+    def events_from(fragments):
+        nonlocal seen, first_event
+        for fragment in fragments:
+            soup = BeautifulSoup(fragment, PARSER_BACKEND)
+            items = selector.select(soup, limit=source['limit'] - seen)
+            seen += len(items)
+            for event in classify_source_events(source, _extract_items(source, items)):
+                if first_event is None:
+                    first_event = time.monotonic() - start
+                yield event
+            if seen >= source['limit']:
+                return
 
-def scrape_klimahuset():
-    """Scrape events from Klimahuset Aarhus"""
-    events = []
-    url = "https://klimahusetaarhus.dk/arrangementer/"
-    
     try:
-        response = requests.get(url, headers=HEADERS, timeout=15)
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        event_items = soup.select('article, .event, .arrangement, .post')
-        
-        for item in event_items[:20]:
-            try:
-                title_elem = item.select_one('h2, h3, .entry-title')
-                link_elem = title_elem.select_one('a') if title_elem else item.select_one('a[href]')
-                
-                if not title_elem or not link_elem:
-                    continue
-                
-                title = title_elem.get_text(strip=True)
-                link = link_elem['href']
-                if not link.startswith('http'):
-                    link = urljoin('https://klimahusetaarhus.dk', link)
-                
-                description_elem = item.select_one('.entry-content, .description, p')
-                description = description_elem.get_text(strip=True)[:300] if description_elem else ""
-                
-                date_elem = item.select_one('.date, .event-date')
-                date_text = date_elem.get_text(strip=True) if date_elem else "Kommer snart"
-                
-                # All Klimahuset events are sustainability-related
-                event = {
-                    'title': title,
-                    'description': description,
-                    'date': date_text,
-                    'time': '',
-                    'location': 'Klimahuset Aarhus',
-                    'address': 'Magistrsparken 2, 8000 Aarhus C',
-                    'link': link,
-                    'source': 'klimahusetaarhus.dk',
-                    'category': 'climate',
-                    'image': '',
-                    'organizer': 'Klimahuset Aarhus',
-                    'points': 100
-                }
-                events.append(event)
-                
-            except Exception as e:
-                print(f"Error parsing event from Klimahuset: {e}")
-                continue
-                
-    except Exception as e:
-        print(f"Error scraping Klimahuset: {e}")
-    
-    return events
+        for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+            yield from events_from(scanner.feed(decoder.decode(chunk)))
+            if seen >= source['limit']:
+                stopped_early = True
+                break
+        else:
+            scanner.feed(decoder.decode(b'', final=True))
+            yield from events_from(scanner.close())
+    finally:
+        bytes_read = response.raw.tell() if hasattr(response.raw, 'tell') else None
+        response.close()
+        record_metric(source['name'], 'stream', bytes=bytes_read or 0,
+                      seconds=time.monotonic() - start, stopped_early=int(stopped_early))
+        with _stream_stats_guard:
+            _stream_stats[source['name']] = {
+                'bytes_read': bytes_read,
+                'content_length': response.headers.get('Content-Length'),
+                'stopped_early': stopped_early,
+                'first_event_seconds': first_event,
+                'seconds': time.monotonic() - start,
+            }
+
+def stream_stats():
+    """Return bytes read and time to first event for streamed sources."""
+    with _stream_stats_guard:
+        return {name: dict(stats) for name, stats in _stream_stats.items()}
+
+def extraction_stats():
+    """Return items extracted and seconds spent per source in this run."""
+    stats = {name: {'items': stages['extract']['items'], 'seconds': stages['extract']['seconds']}
+             for name, stages in run_metrics().items() if 'extract' in stages}
+    for counts in stats.values():
+        counts['us_per_item'] = counts['seconds'] / counts['items'] * 1e6 if counts['items'] else 0.0
+    return stats
+
+def _unchanged_source_events(source, page):
+    if EVENT_STORE is not None:
+        EVENT_STORE.touch_source(source['name'])
+    return page.cached_events
+
+def iter_source_events(source, deadline=None):
+    """Yield the events of one registry source.
+
+    In streaming mode events are yielded while the page downloads; sources
+    whose item selector cannot be matched incrementally are parsed whole.
+    """
+    stream = STREAM_LISTINGS and listing_strainer(source['items']) is not None
+    page = fetch_source_page(source['name'], source['url'], stream=stream, deadline=deadline)
+    if page.unchanged:
+        yield from _unchanged_source_events(source, page)
+        return
+
+    if page.response is not None:
+        events = []
+        for event in stream_events(source, page.response):
+            events.append(event)
+            yield event
+    else:
+        start = time.perf_counter()
+        soup = parse_listing(source, page.content)
+        record_metric(source['name'], 'parse', bytes=len(page.content),
+                      seconds=time.perf_counter() - start)
+        events = classify_source_events(source, extract_events(source, soup))
+        yield from events
+    page.remember(events)
 
-def scrape_godsbanen():
-    """Scrape events from Godsbanen"""
+def scrape_source(source, deadline=None):
+    """Fetch, extract and classify the events of one registry source."""
     events = []
-    url = "https://godsbanen.dk/arrangementer"
-    
     try:
-        response = requests.get(url, headers=HEADERS, timeout=15)
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        event_items = soup.select('.event, .arrangement, article, .post')
-        
-        for item in event_items[:25]:
-            try:
-                title_elem = item.select_one('h2, h3, .event-title')
-                link_elem = item.select_one('a[href]')
-                
-                if not title_elem or not link_elem:
-                    continue
-                
-                title = title_elem.get_text(strip=True)
-                link = link_elem['href']
-                if not link.startswith('http'):
-                    link = urljoin('https://godsbanen.dk', link)
-                
-                description_elem = item.select_one('.description, .excerpt, p')
-                description = description_elem.get_text(strip=True)[:300] if description_elem else ""
-                
-                date_elem = item.select_one('.date, .event-date')
-                date_text = date_elem.get_text(strip=True) if date_elem else "Aktiviteter"
-                
-                if contains_sustainability_keywords(f"{title} {description}"):
-                    event = {
-                        'title': title,
-                        'description': description,
-                        'date': date_text,
-                        'time': '',
-                        'location': 'Godsbanen',
-                        'address': 'Skovgaardsgade 3, 8000 Aarhus C',
-                        'link': link,
-                        'source': 'godsbanen.dk',
-                        'category': 'creative',
-                        'image': '',
-                        'organizer': 'Godsbanen',
-                        'points': 100
-                    }
-                    events.append(event)
-                    
-            except Exception as e:
-                print(f"Error parsing event from Godsbanen: {e}")
-                continue
-                
+        events.extend(iter_source_events(source, deadline))
+    except (CircuitOpen, DeadlineExceeded) as e:
+        record_metric(source['name'], 'fetch', skipped=1)
+        print(f"⏭️ Skipped {source['name']}: {e}")
     except Exception as e:
-        print(f"Error scraping Godsbanen: {e}")
-    
+        record_metric(source['name'], 'fetch', errors=1)
+        print(f"Error scraping {source['name']}: {e}")
     return events
 
 def extract_events_from_pdf():
     """Extract event information from the PDF content"""
-    events = []
-    
     # These are example events from the PDF (you would need to parse the actual PDF)
     # Since we can't parse the image PDF, I'll create some based on what I see
     
@@ -647,152 +1484,1096 @@ def extract_events_from_pdf():
     
     # Filter for sustainability events
     for event in pdf_based_events:
-        if contains_sustainability_keywords(f"{event['title']} {event['description']}"):
-            events.append(event)
-    
-    return events
+        event['region'] = DEFAULT_REGION
+    return classify_events(pdf_based_events)
 
-def clean_and_deduplicate_events(events):
-    """Clean and remove duplicate events"""
-    seen_titles = set()
-    cleaned_events = []
+# Date words used by Danish and English event listings
+MONTHS = {
+    'januar': 1, 'january': 1, 'jan': 1,
+    'februar': 2, 'february': 2, 'feb': 2,
+    'marts': 3, 'march': 3, 'mar': 3,
+    'april': 4, 'apr': 4,
+    'maj': 5, 'may': 5,
+    'juni': 6, 'june': 6, 'jun': 6,
+    'juli': 7, 'july': 7, 'jul': 7,
+    'august': 8, 'aug': 8,
+    'september': 9, 'sept': 9, 'sep': 9,
+    'oktober': 10, 'october': 10, 'okt': 10, 'oct': 10,
+    'november': 11, 'nov': 11,
+    'december': 12, 'dec': 12,
+}
+
+WEEKDAYS = {
+    'mandag': 0, 'monday': 0,
+    'tirsdag': 1, 'tuesday': 1,
+    'onsdag': 2, 'wednesday': 2,
+    'torsdag': 3, 'thursday': 3,
+    'fredag': 4, 'friday': 4,
+    'lørdag': 5, 'saturday': 5,
+    'søndag': 6, 'sunday': 6,
+}
+
+# Abbreviations such as "man" or "sat" are also ordinary words, so they only
+# count with a trailing "." or "," ("tor. 12. marts", "fri, 19:00")
+WEEKDAY_ABBREVIATIONS = {
+    'man': 0, 'mon': 0,
+    'tirs': 1, 'tir': 1, 'tue': 1, 'tues': 1,
+    'ons': 2, 'wed': 2,
+    'tors': 3, 'tor': 3, 'thu': 3, 'thurs': 3,
+    'fre': 4, 'fri': 4,
+    'lør': 5, 'sat': 5,
+    'søn': 6, 'sun': 6,
+}
+
+RELATIVE_DAYS = {'i dag': 0, 'today': 0, 'i morgen': 1, 'tomorrow': 1, 'i overmorgen': 2}
+
+# A date without a year that lies further back than this is taken to be next year's
+PAST_DATE_GRACE = timedelta(days=60)
+
+def _word_pattern(words):
+    return '|'.join(re.escape(word) for word in sorted(words, key=len, reverse=True))
+
+_MONTH_WORDS = _word_pattern(MONTHS)
+_DAY_MONTH = re.compile(
+    r'\b(\d{1,2})\.?(?:\s*[-–]\s*\d{1,2}\.?)?\s*(?:of\s+)?(' + _MONTH_WORDS + r')\b\.?(?:\s*(\d{4})\b)?')
+_MONTH_DAY = re.compile(
+    r'\b(' + _MONTH_WORDS + r')\.?\s+(\d{1,2})(?:st|nd|rd|th)?\b(?:,?\s*(\d{4})\b)?')
+_ISO_DATE = re.compile(r'\b(\d{4})-(\d{1,2})-(\d{1,2})(?:[t ](\d{1,2}):(\d{2}))?')
+_NUMERIC_DATE = re.compile(r'\b(\d{1,2})[./](\d{1,2})(?:[./](\d{4}|\d{2}))?\b')
+_WEEKDAY = re.compile(r'\b(' + _word_pattern(WEEKDAYS) + r')\b'
+                      r'|\b(' + _word_pattern(WEEKDAY_ABBREVIATIONS) + r')[.,]')
+_RELATIVE_DAY = re.compile(r'\b(' + _word_pattern(RELATIVE_DAYS) + r')\b')
+_CLOCK_TIME = re.compile(
+    r'\bkl\.?\s*(\d{1,2})(?:[:.](\d{2}))?\b|\b(\d{1,2}):(\d{2})\b|\b(\d{1,2})(?:[:.](\d{2}))?\s*(am|pm)\b')
+_BARE_TIME = re.compile(r'^\s*(\d{1,2})[:.](\d{2})\b')
+
+def _parse_clock(text, bare=False):
+    """(hour, minute) of the first clock time in text, or None.
+
+    With bare, a leading "19.30" also counts; that is only safe for time
+    fields, as in a date field it is more likely a day and month.
+    """
+    match = _CLOCK_TIME.search(text) or (bare and _BARE_TIME.search(text))
+    if not match:
+        return None
+    groups = match.groups()
+    if match.re is _BARE_TIME:
+        hour, minute, suffix = groups[0], groups[1], None
+    elif groups[0] is not None:
+        hour, minute, suffix = groups[0], groups[1], None
+    elif groups[2] is not None:
+        hour, minute, suffix = groups[2], groups[3], None
+    else:
+        hour, minute, suffix = groups[4], groups[5], groups[6]
+    hour, minute = int(hour), int(minute or 0)
+    if suffix == 'pm' and hour < 12:
+        hour += 12
+    elif suffix == 'am' and hour == 12:
+        hour = 0
+    if hour > 23 or minute > 59:
+        return None
+    return hour, minute
+
+def _make_date(year, month, day, today):
+    """A date, inferring the year when it is missing. None if invalid."""
+    try:
+        if year is None:
+            candidate = date(today.year, month, day)
+            if candidate < today - PAST_DATE_GRACE:
+                candidate = date(today.year + 1, month, day)
+            return candidate
+        year = int(year)
+        if year < 100:
+            year += 2000
+        return date(year, month, day)
+    except ValueError:
+        return None
+
+def _parse_day(text, today):
+    """The calendar date described by lowercased text, or None."""
+    match = _ISO_DATE.search(text)
+    if match:
+        return _make_date(match.group(1), int(match.group(2)), int(match.group(3)), today)
+
+    match = _DAY_MONTH.search(text)
+    if match:
+        return _make_date(match.group(3), MONTHS[match.group(2)], int(match.group(1)), today)
+
+    match = _MONTH_DAY.search(text)
+    if match:
+        return _make_date(match.group(3), MONTHS[match.group(1)], int(match.group(2)), today)
+
+    for match in _NUMERIC_DATE.finditer(text):
+        parsed = _make_date(match.group(3), int(match.group(2)), int(match.group(1)), today)
+        if parsed:
+            return parsed
+
+    match = _RELATIVE_DAY.search(text)
+    if match:
+        return today + timedelta(days=RELATIVE_DAYS[match.group(1)])
+
+    match = _WEEKDAY.search(text)
+    if match:
+        weekday = WEEKDAYS[match.group(1)] if match.group(1) else WEEKDAY_ABBREVIATIONS[match.group(2)]
+        return today + timedelta(days=(weekday - today.weekday()) % 7)
+    return None
+
+@functools.lru_cache(maxsize=4096)
+def _parse_event_datetime(date_text, time_text, today):
+    date_text = unicodedata.normalize('NFKC', date_text).lower()
+    time_text = unicodedata.normalize('NFKC', time_text).lower()
+
+    iso = _ISO_DATE.search(date_text)
+    clock = (iso.group(4), iso.group(5)) if iso and iso.group(4) else None
+    clock = clock and (int(clock[0]), int(clock[1]))
+    clock = clock or _parse_clock(time_text, bare=True) or _parse_clock(date_text)
+
+    # Remove clock times so "kl. 10.12" is not read as the 10th of December
+    day = _parse_day(_CLOCK_TIME.sub(' ', date_text), today)
+    if day is None:
+        return None
+    if clock is None:
+        return datetime(day.year, day.month, day.day), False
+    return datetime(day.year, day.month, day.day, *clock), True
+
+def parse_event_datetime(date_text, time_text='', today=None):
+    """Parse a listing's free-text date and time.
+
+    Returns (start, has_time), or None for placeholders like "Se link for
+    dato". Dates without a year are placed on or after today, less a short
+    grace period for events that have just happened. Results are cached, as
+    the same few date strings repeat across sources and runs.
+    """
+    return _parse_event_datetime(date_text or '', time_text or '', today or date.today())
+
+def event_start(event, today=None):
+    """ISO start of an event: 'YYYY-MM-DDTHH:MM', 'YYYY-MM-DD' or None."""
+    parsed = parse_event_datetime(event.get('date'), event.get('time'), today)
+    if parsed is None:
+        return None
+    start, has_time = parsed
+    return start.isoformat(timespec='minutes') if has_time else start.date().isoformat()
+
+def chronological_key(event, today=None):
+    """Sort upcoming events by start, then undated events, then past ones."""
+    start = event.get('start')
+    if not start:
+        return (1, '')
+    if start[:10] >= (today or date.today()).isoformat():
+        return (0, start)
+    return (2, start)
+
+def build_date_index(events):
+    """Map each start day (or 'undated') to the positions of its events."""
+    index = {}
+    for position, event in enumerate(events):
+        day = event['start'][:10] if event.get('start') else 'undated'
+        index.setdefault(day, []).append(position)
+    return index
+
+# Near-duplicate detection across sources
+DUPLICATE_THRESHOLD = 0.6   # Jaccard similarity of normalized title words
+MAX_POSTINGS = 100          # titles indexed per word; bounds work on very common words
+
+_PUNCTUATION = re.compile(r'[^\w\s]+')
+_DIGITS = re.compile(r'\d+')
+
+def normalize_title(title):
+    """Casefold a title and strip punctuation and extra whitespace."""
+    text = unicodedata.normalize('NFKC', title).casefold()
+    return ' '.join(_PUNCTUATION.sub(' ', text).split())
+
+def title_tokens(title):
+    """The set of words in a normalized title."""
+    return frozenset(normalize_title(title).split())
+
+def token_frequencies(events):
+    """Count in how many event titles each word occurs."""
+    counts = Counter()
+    for event in events:
+        counts.update(title_tokens(event['title']))
+    return counts
+
+def _dates_compatible(first, second):
+    first_parsed = parse_event_datetime(first.get('date'))
+    second_parsed = parse_event_datetime(second.get('date'))
+    if first_parsed and second_parsed:
+        return first_parsed[0].date() == second_parsed[0].date()
+    # Unparsed dates come in many formats; only rule out pairs whose numbers disagree
+    first_numbers = set(_DIGITS.findall(first.get('date') or ''))
+    second_numbers = set(_DIGITS.findall(second.get('date') or ''))
+    return (not first_numbers or not second_numbers
+            or first_numbers <= second_numbers or second_numbers <= first_numbers)
+
+def merge_duplicate(primary, duplicate):
+    """Fill in a primary event's missing fields from a duplicate listing."""
+    for field, value in duplicate.items():
+        if field in ('categories', 'matched_keywords'):
+            primary[field] = list(dict.fromkeys(primary.get(field, []) + value))
+        elif field == 'description':
+            value = (value or '').strip()
+            if len(value) > len(primary.get(field) or ''):
+                primary[field] = value
+        elif value and not primary.get(field):
+            primary[field] = value
+    if duplicate.get('source') and duplicate['source'] != primary.get('source'):
+        also_listed = primary.setdefault('also_listed_on', [])
+        if duplicate['source'] not in also_listed:
+            also_listed.append(duplicate['source'])
+
+class NearDuplicateIndex:
+    """Incremental index that finds events already seen under a similar title.
+
+    Titles are compared as sets of normalized words. Two sets with Jaccard
+    similarity >= threshold must share one of the first few words of each
+    set in a fixed global order (prefix filtering), so only those prefix
+    words are indexed and looked up. Ordering by token_frequencies() puts
+    rare words first, which keeps posting lists short and the work roughly
+    linear; without frequencies a hash order is used, which finds the same
+    duplicates with more comparisons. A word stops being indexed after
+    MAX_POSTINGS titles, so generic titles cannot make the work quadratic.
+
+    Events with the same title are always duplicates. Different titles only
+    count when they come from different hosts and their dates do not
+    disagree, so repeated listings of a recurring event on one site stay.
+    """
+
+    def __init__(self, threshold=DUPLICATE_THRESHOLD, frequencies=None):
+        self.threshold = threshold
+        self.frequencies = frequencies
+        self._by_title = {}
+        self._postings = {}
+        self._entries = []
+
+    def _prefix(self, tokens):
+        if self.frequencies is not None:
+            ordered = sorted(tokens, key=lambda token: (self.frequencies[token], token))
+        else:
+            ordered = sorted(tokens, key=lambda token: (zlib.crc32(token.encode('utf-8')), token))
+        length = len(ordered) - math.ceil(self.threshold * len(ordered)) + 1
+        return ordered[:length]
+
+    def add(self, event):
+        """Return the earlier event this one duplicates, or index it and return None."""
+        title_key = event['title'].strip().lower()
+        if title_key in self._by_title:
+            return self._by_title[title_key]
+
+        tokens = title_tokens(event['title'])
+        host = urlparse(event.get('link') or '').netloc
+        prefix = self._prefix(tokens)
+
+        candidates = set()
+        for token in prefix:
+            candidates.update(self._postings.get(token, ()))
+        size = len(tokens)
+        min_size = self.threshold * size
+        max_size = size / self.threshold
+        for index in sorted(candidates):
+            other, other_tokens, other_host = self._entries[index]
+            other_size = len(other_tokens)
+            if (host and host == other_host) or not min_size <= other_size <= max_size:
+                continue
+            overlap = len(tokens & other_tokens)
+            if overlap >= self.threshold * (size + other_size - overlap) and _dates_compatible(event, other):
+                return other
+
+        index = len(self._entries)
+        self._entries.append((event, tokens, host))
+        self._by_title[title_key] = event
+        for token in prefix:
+            postings = self._postings.setdefault(token, [])
+            if len(postings) < MAX_POSTINGS:
+                postings.append(index)
+        return None
+
+def iter_clean_events(events, frequencies=None):
+    """Clean events and yield each one not seen before.
+
+    Later duplicates are merged into the event already yielded, so callers
+    that keep the yielded dicts see the merged fields. Without frequencies
+    the near-duplicate index works in a single pass over a stream.
+    """
+    index = NearDuplicateIndex(frequencies=frequencies)
     
     for event in events:
         # Clean the title
-        title = event['title'].strip()
-        title_key = title.lower()
+        event['title'] = event['title'].strip()
         
-        # Skip if we've seen this title before
-        if title_key in seen_titles:
+        # Merge into the earlier listing if we've seen this event before
+        primary = index.add(event)
+        if primary is not None:
+            merge_duplicate(primary, event)
+            record_metric(event.get('source', 'unknown'), 'dedup', dropped=1)
             continue
-        
-        seen_titles.add(title_key)
+        record_metric(event.get('source', 'unknown'), 'dedup', kept=1)
         
         # Clean other fields
-        event['title'] = title
-        event['description'] = event['description'].strip() if event['description'] else ""
+        event['description'] = event['description'].strip() if event.get('description') else ""
         
         # Add default values if missing
         if not event.get('location'):
-            event['location'] = 'Aarhus'
+            event['location'] = region_city(event.get('region'))
         if not event.get('category'):
             event['category'] = 'event'
         
-        cleaned_events.append(event)
-    
-    return cleaned_events
+        yield event
+
+def clean_and_deduplicate_events(events):
+    """Clean events and merge duplicates, including near-duplicates across sources"""
+    return list(iter_clean_events(events, token_frequencies(events)))
+
+# Optional enrichment of events from their detail pages
+ENRICH_DETAILS = False
+ENRICH_WORKERS = 16         # detail pages fetched in parallel overall
+ENRICH_PER_HOST = 4         # detail pages fetched in parallel from one host
+DETAIL_HOST_DELAY = 0.1     # minimum seconds between detail requests to one host
+DETAIL_CACHE_TTL = 24 * 3600  # seconds before a cached detail page is revalidated
+
+_detail_host_slots = {}
+_detail_stats = {}
+_detail_stats_guard = threading.Lock()
+
+def configure_enrichment(enabled=True, workers=ENRICH_WORKERS, per_host=ENRICH_PER_HOST):
+    """Turn detail-page enrichment on or off and set its concurrency limits."""
+    global ENRICH_DETAILS, ENRICH_WORKERS, ENRICH_PER_HOST
+    ENRICH_DETAILS = enabled
+    ENRICH_WORKERS = workers
+    ENRICH_PER_HOST = per_host
+    with _detail_stats_guard:
+        _detail_host_slots.clear()
+        _detail_stats.clear()
+
+def _slots_for_host(host):
+    """Return the semaphore limiting concurrent detail fetches from one host."""
+    with _detail_stats_guard:
+        if host not in _detail_host_slots:
+            _detail_host_slots[host] = threading.BoundedSemaphore(ENRICH_PER_HOST)
+        return _detail_host_slots[host]
+
+def _record_detail_result(result):
+    with _detail_stats_guard:
+        _detail_stats[result] = _detail_stats.get(result, 0) + 1
+
+def detail_stats():
+    """Return how detail pages were served: cached, revalidated, fetched or failed."""
+    with _detail_stats_guard:
+        return dict(_detail_stats)
+
+def _detail_cache_path(url):
+    name = hashlib.sha1(url.encode('utf-8')).hexdigest()
+    return os.path.join(CACHE_DIR, 'details', f"{name}.json")
+
+def _load_detail_entry(url):
+    if not CACHE_DIR:
+        return None
+    try:
+        with open(_detail_cache_path(url), encoding='utf-8') as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return entry if entry.get('version') == CACHE_VERSION and entry.get('url') == url else None
+
+def _save_detail_entry(url, entry):
+    if not CACHE_DIR:
+        return
+    path = _detail_cache_path(url)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(entry, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+def _find_jsonld_event(data):
+    """Return the first schema.org Event (or subtype) in parsed JSON-LD."""
+    if isinstance(data, list):
+        for item in data:
+            found = _find_jsonld_event(item)
+            if found:
+                return found
+    elif isinstance(data, dict):
+        types = data.get('@type', [])
+        if isinstance(types, str):
+            types = [types]
+        if any(isinstance(kind, str) and kind.endswith('Event') for kind in types):
+            return data
+        return _find_jsonld_event(data.get('@graph', []))
+    return None
+
+def _jsonld_text(value, *keys):
+    """First usable string in a JSON-LD value that may be a string, object or list."""
+    if isinstance(value, list):
+        value = value[0] if value else None
+    if isinstance(value, dict):
+        value = next((value[key] for key in keys if isinstance(value.get(key), str)), None)
+    return value.strip() if isinstance(value, str) else ''
+
+def _jsonld_address(location):
+    if isinstance(location, list):
+        location = location[0] if location else None
+    if not isinstance(location, dict):
+        return _jsonld_text(location)
+    address = location.get('address')
+    if isinstance(address, dict):
+        parts = [address.get(key) for key in ('streetAddress', 'postalCode', 'addressLocality')]
+        return ', '.join(part.strip() for part in parts if isinstance(part, str) and part.strip())
+    return _jsonld_text(address) or _jsonld_text(location, 'name')
+
+def extract_event_details(content, url):
+    """Read image, organizer, date, time and address from a detail page.
+
+    schema.org Event data in JSON-LD is preferred; og:image is the fallback
+    for the image. Only script and meta tags are parsed.
+    """
+    soup = BeautifulSoup(content, PARSER_BACKEND, parse_only=SoupStrainer(['script', 'meta']))
+    details = {}
+    for script in soup.find_all('script', type='application/ld+json'):
+        try:
+            event = _find_jsonld_event(json.loads(script.string or ''))
+        except ValueError:
+            continue
+        if not event:
+            continue
+        image = _jsonld_text(event.get('image'), 'url', 'contentUrl')
+        if image:
+            details['image'] = urljoin(url, image)
+        organizer = _jsonld_text(event.get('organizer'), 'name')
+        if organizer:
+            details['organizer'] = organizer
+        parsed = parse_event_datetime(_jsonld_text(event.get('startDate')))
+        if parsed:
+            start, has_time = parsed
+            details['date'] = start.date().isoformat()
+            if has_time:
+                details['time'] = start.strftime('%H:%M')
+        address = _jsonld_address(event.get('location'))
+        if address:
+            details['address'] = address
+        break
+
+    if 'image' not in details:
+        og_image = soup.find('meta', attrs={'property': 'og:image'})
+        if og_image and og_image.get('content'):
+            details['image'] = urljoin(url, og_image['content'])
+    return details
+
+def fetch_event_details(url):
+    """Return the details of one event page, using the per-URL cache.
+
+    Cached details younger than DETAIL_CACHE_TTL are used as is; older ones
+    are revalidated with a conditional GET. Pages that are gone are cached
+    as having no details so they are not requested on every run.
+    """
+    entry = _load_detail_entry(url)
+    if entry and time.time() - entry['fetched_at'] < DETAIL_CACHE_TTL:
+        _record_detail_result('cached')
+        return entry['details']
+
+    headers = {}
+    if entry and entry.get('etag'):
+        headers['If-None-Match'] = entry['etag']
+    if entry and entry.get('last_modified'):
+        headers['If-Modified-Since'] = entry['last_modified']
+
+    host = urlparse(url).netloc
+    with _slots_for_host(host):
+        # failing detail pages must not trip the breaker for the listing page
+        response = polite_get(url, delay=DETAIL_HOST_DELAY, headers=headers,
+                              circuit=f"{host} details")
+
+    if response.status_code == 304 and entry:
+        _record_detail_result('revalidated')
+        entry['fetched_at'] = time.time()
+        _save_detail_entry(url, entry)
+        return entry['details']
+
+    if response.status_code in (404, 410):
+        details = {}
+    else:
+        response.raise_for_status()
+        details = extract_event_details(response.content, url)
+    _record_detail_result('fetched')
+    _save_detail_entry(url, {
+        'version': CACHE_VERSION,
+        'url': url,
+        'fetched_at': time.time(),
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified'),
+        'details': details,
+    })
+    return details
+
+def _needs_details(event):
+    """True if an event has a detail page and fields it could fill."""
+    link = event.get('link') or ''
+    if not link.startswith('http'):
+        return False
+    return (not event.get('image') or not event.get('organizer')
+            or not _parse_clock(event.get('time') or '', bare=True)
+            or parse_event_datetime(event.get('date')) is None)
+
+def apply_event_details(event, details):
+    """Fill an event's empty or placeholder fields from its detail page."""
+    for field in ('image', 'organizer'):
+        if details.get(field) and not event.get(field):
+            event[field] = details[field]
+    if details.get('date') and parse_event_datetime(event.get('date')) is None:
+        event['date'] = details['date']
+    if details.get('time') and not _parse_clock(event.get('time') or '', bare=True):
+        event['time'] = details['time']
+    # Several sources copy the location into the address
+    if details.get('address') and event.get('address') in ('', event.get('location')):
+        event['address'] = details['address']
+    return event
+
+def enrich_event(event):
+    """Fill one event from its detail page; failures leave it unchanged."""
+    if not _needs_details(event):
+        return event
+    start = time.perf_counter()
+    errors = 0
+    try:
+        apply_event_details(event, fetch_event_details(event['link']))
+    except Exception as e:
+        _record_detail_result('failed')
+        errors = 1
+        print(f"   Error enriching {event['link']}: {e}")
+    record_metric(event.get('source', 'unknown'), 'enrich', pages=1, errors=errors,
+                  seconds=time.perf_counter() - start)
+    return event
+
+def iter_enriched_events(events, workers=None):
+    """Yield events in their original order, enriched from detail pages.
+
+    Up to `workers` pages are fetched at once (ENRICH_PER_HOST per host), and
+    only a small window of events is held ahead of the slowest fetch, so this
+    also works on a stream.
+    """
+    workers = workers or ENRICH_WORKERS
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for event in events:
+            pending.append(pool.submit(enrich_event, event))
+            if len(pending) >= workers * 4:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
 
 def categorize_event(event):
     """Categorize event based on keywords in title and description"""
-    text = f"{event['title']} {event['description']}".lower()
-    
-    categories = []
-    
-    # Define category keywords
-    category_keywords = {
-        'cleaning': ['renhold', 'oprydning', 'clean-up', 'skrald', 'affald', 'plastik'],
-        'food': ['madspild', 'madlavning', 'fødevare', 'spise', 'måltid', 'fællesspisning'],
-        'repair': ['repair', 'reparation', 'fix', 'istandsættelse'],
-        'workshop': ['workshop', 'kursus', 'læring', 'undervisning', 'foredrag'],
-        'gardening': ['have', 'plante', 'dyrkning', 'gartneri', 'grøntsag', 'frugt'],
-        'transport': ['cykel', 'transport', 'mobilitet', 'elbil', 'løb', 'vandring'],
-        'energy': ['energi', 'besparelse', 'solcelle', 'vindmølle', 'co2'],
-        'community': ['fællesskab', 'forening', 'frivillig', 'samfund', 'community'],
-        'swap': ['swap', 'bytte', 'genbrugsmarked', 'loppemarked'],
-        'climate': ['klima', 'klimahuset', 'co2', 'opvarmning'],
-        'creative': ['kunst', 'design', 'kreativ', 'håndværk']
-    }
-    
-    for category, keywords in category_keywords.items():
-        if any(keyword in text for keyword in keywords):
-            categories.append(category)
-    
-    # Add sustainability as default if no specific category found
-    if not categories:
-        categories.append('sustainability')
-    
+    _, _, categories = EVENT_CLASSIFIER.classify(f"{event['title']} {event.get('description') or ''}")
     event['categories'] = categories
     return event
 
-def main():
-    print("🚀 Starting Aarhus Sustainability Events Scraper...")
-    print("=" * 50)
-    
+def iter_categorized_events(events):
+    """Yield events with categories and a parsed start date."""
+    for event in events:
+        # Scraped events were categorized by classify_events while filtering
+        if 'categories' not in event:
+            event = categorize_event(event)
+        event['start'] = event_start(event)
+        yield event
+
+def run_scraper(source, run_deadline=None):
+    """Run one registry source, returning its events and the elapsed seconds.
+
+    The source gets SOURCE_BUDGET seconds from when it starts, cut short
+    by the run deadline (a time.monotonic() timestamp) if that comes first.
+    """
+    start = time.monotonic()
+    events = scrape_source(source, source_deadline(start, run_deadline))
+    return events, time.monotonic() - start
+
+def source_deadline(start, run_deadline=None):
+    """SOURCE_BUDGET seconds from start, or the run deadline if that comes first."""
+    deadline = start + SOURCE_BUDGET if SOURCE_BUDGET else None
+    if run_deadline is not None:
+        deadline = run_deadline if deadline is None else min(deadline, run_deadline)
+    return deadline
+
+def run_deadline():
+    """The time.monotonic() deadline for a fetch run starting now, if any."""
+    return time.monotonic() + RUN_DEADLINE if RUN_DEADLINE else None
+
+# Pipelined scraping: I/O threads fetch pages while worker processes parse,
+# extract and classify the pages that have arrived
+PARSE_PROCESSES = 0         # 0 parses in the fetching threads instead
+MAX_PENDING_PAGES = 16      # fetched pages waiting for a worker at most
+
+# Workers are spawned rather than forked, as forking while fetch threads
+# hold locks can leave a child waiting on a lock nobody will release
+_SPAWN = multiprocessing.get_context('spawn')
+
+def configure_pipeline(processes=0, max_pending=MAX_PENDING_PAGES):
+    """Set the number of parse processes (0 disables the pipeline)."""
+    global PARSE_PROCESSES, MAX_PENDING_PAGES
+    PARSE_PROCESSES = processes
+    MAX_PENDING_PAGES = max_pending
+
+def parse_page(source, content, backend, subtree, regions):
+    """Parse, extract and keyword-classify one listing page in a worker process.
+
+    regions is the parent's REGIONS, which a spawned process does not see
+    when they came from a catalogue. Returns the candidates and the worker's
+    metrics for the source, so the parent can filter them through the event
+    store and merge the metrics.
+    """
+    REGIONS.update(regions)
+    reset_metrics()
+    start = time.perf_counter()
+    soup = parse_listing(source, content, backend, subtree)
+    record_metric(source['name'], 'parse', bytes=len(content), seconds=time.perf_counter() - start)
+    candidates = extract_events(source, soup)
+    classify_events(candidates, require_relevance=False)
+    return candidates, run_metrics().get(source['name'], {})
+
+def _fetch_for_pipeline(source, run_deadline, slots):
+    """Fetch one page once a pending slot is free; errors are reported, not raised.
+
+    The source's budget starts once it has a slot, so waiting behind slow
+    parsing does not use it up.
+    """
+    slots.acquire()
+    try:
+        deadline = source_deadline(time.monotonic(), run_deadline)
+        return fetch_source_page(source['name'], source['url'], deadline=deadline)
+    except (CircuitOpen, DeadlineExceeded) as e:
+        record_metric(source['name'], 'fetch', skipped=1)
+        print(f"⏭️ Skipped {source['name']}: {e}")
+    except Exception as e:
+        record_metric(source['name'], 'fetch', errors=1)
+        print(f"Error scraping {source['name']}: {e}")
+    slots.release()
+    return None
+
+def scrape_pipelined(sources, max_workers=MAX_WORKERS, processes=None, max_pending=None):
+    """Run sources through fetch threads and a parse process pool.
+
+    Returns (events, elapsed) per source, in source order. A fetch only
+    starts once fewer than max_pending fetched pages are waiting to be
+    parsed, so slow parsing holds back fetching instead of piling pages up
+    in memory. Pages that have not changed skip the process pool.
+    """
+    processes = processes or PARSE_PROCESSES or os.cpu_count()
+    slots = threading.BoundedSemaphore(max_pending or MAX_PENDING_PAGES)
+    deadline = run_deadline()
+    started = {}
+    results = {}
+
+    def finish(source, events):
+        results[source['name']] = (events, time.monotonic() - started[source['name']])
+
+    def fetch(source):
+        started[source['name']] = time.monotonic()
+        return _fetch_for_pipeline(source, deadline, slots)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as io_pool, \
+            ProcessPoolExecutor(max_workers=processes, mp_context=_SPAWN) as cpu_pool:
+        fetches = {io_pool.submit(fetch, source): source for source in sources}
+        parses = {}
+        for future in as_completed(fetches):
+            source = fetches[future]
+            page = future.result()
+            if page is None:
+                finish(source, [])
+            elif page.unchanged:
+                slots.release()
+                finish(source, _unchanged_source_events(source, page))
+            else:
+                parse = cpu_pool.submit(parse_page, source, page.content, PARSER_BACKEND,
+                                       PARSE_SUBTREE, REGIONS)
+                parse.add_done_callback(lambda _: slots.release())
+                parses[parse] = (source, page)
+
+        for future in as_completed(parses):
+            source, page = parses[future]
+            try:
+                candidates, metrics = future.result()
+            except Exception as e:
+                record_metric(source['name'], 'parse', errors=1)
+                print(f"Error scraping {source['name']}: {e}")
+                finish(source, [])
+                continue
+            for stage, values in metrics.items():
+                record_metric(source['name'], stage, **values)
+            finish(source, page.remember(classify_source_events(source, candidates)))
+
+    return [results[source['name']] for source in sources]
+
+def scrape_all(sources, concurrent=True, max_workers=MAX_WORKERS):
+    """Run every source and return their events in source order.
+
+    In concurrent mode all sources are fetched in parallel from a bounded
+    thread pool; politeness delays are applied per host by polite_get.
+    Sources still waiting when RUN_DEADLINE passes are skipped. With
+    PARSE_PROCESSES set, pages are parsed in worker processes instead.
+    """
+    deadline = run_deadline()
+    if concurrent and PARSE_PROCESSES:
+        results = scrape_pipelined(sources, max_workers)
+    elif concurrent:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(lambda source: run_scraper(source, deadline), sources))
+    else:
+        results = [run_scraper(source, deadline) for source in sources]
+
     all_events = []
-    
-    # Scrape from all websites
-    sources = [
-        ("migogaarhus.dk", scrape_migogaarhus),
-        ("tipaarhus.dk", scrape_tipaarhus),
-        ("visitaarhus.dk", scrape_visitaarhus),
-        ("aarhusliv.dk", scrape_aarhusliv),
-        ("aarhusevents.dk", scrape_aarhusevents),
-        ("aarhusinside.dk", scrape_aarhusinside),
-        ("domen.aarhus.dk", scrape_domen_aarhus),
-        ("klimahusetaarhus.dk", scrape_klimahuset),
-        ("godsbanen.dk", scrape_godsbanen),
-    ]
-    
-    for source_name, scraper_func in sources:
-        print(f"📡 Scraping {source_name}...")
+    for source, (events, elapsed) in zip(sources, results):
+        print(f"📡 {source['name']}: found {len(events)} events in {elapsed:.1f}s")
+        all_events.extend(events)
+    return all_events
+
+def iter_scraped_events(sources, concurrent=True, max_workers=MAX_WORKERS):
+    """Yield the events of each source as soon as that source finishes,
+    followed by the PDF events."""
+    deadline = run_deadline()
+    if concurrent:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {pool.submit(run_scraper, source, deadline): source for source in sources}
+            for future in as_completed(futures):
+                events, elapsed = future.result()
+                print(f"📡 {futures[future]['name']}: found {len(events)} events in {elapsed:.1f}s")
+                yield from events
+    else:
+        for source in sources:
+            events, elapsed = run_scraper(source, deadline)
+            print(f"📡 {source['name']}: found {len(events)} events in {elapsed:.1f}s")
+            yield from events
+    yield from extract_events_from_pdf()
+
+def finish_store_run():
+    """Close the event store's run and save its diff next to the output."""
+    diff = EVENT_STORE.finish_run()
+    with open('aarhus_sustainability_events.diff.json', 'w', encoding='utf-8') as f:
+        json.dump(diff, f, ensure_ascii=False, indent=2)
+    print(f"🔁 Since last run: {len(diff['added'])} added, {len(diff['changed'])} changed, "
+          f"{len(diff['removed'])} removed (see 'aarhus_sustainability_events.diff.json')")
+    return diff
+
+# Stages that can be chained as NDJSON, one JSON event per line
+NDJSON_STAGES = ('scrape', 'clean', 'enrich', 'categorize')
+# Enriching fetches every event's detail page, so it only runs when asked for
+NDJSON_DEFAULT_STAGES = ('scrape', 'clean', 'categorize')
+
+def read_ndjson(stream):
+    """Yield events from NDJSON lines, skipping blank and malformed lines."""
+    for line_number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
         try:
-            events = scraper_func()
-            all_events.extend(events)
-            print(f"   Found {len(events)} events")
-        except Exception as e:
-            print(f"   Error: {e}")
-        time.sleep(1)  # Be polite to servers
-    
-    print("=" * 50)
-    
-    # Add events from PDF analysis
-    print("📄 Adding events from PDF analysis...")
-    pdf_events = extract_events_from_pdf()
-    all_events.extend(pdf_events)
-    print(f"   Added {len(pdf_events)} events from PDF")
+            yield json.loads(line)
+        except ValueError as e:
+            print(f"   Skipping malformed line {line_number}: {e}")
+
+def run_ndjson(stages=NDJSON_DEFAULT_STAGES, concurrent=True, max_workers=MAX_WORKERS, sources=SOURCES):
+    """Run the given stages as a stream, writing NDJSON to stdout.
+
+    Without the scrape stage events are read as NDJSON from stdin. Progress
+    messages go to stderr so stdout carries only events.
+    """
+    out = sys.stdout
+    reset_metrics()
+    with contextlib.redirect_stdout(sys.stderr):
+        if 'scrape' in stages:
+            if EVENT_STORE is not None:
+                EVENT_STORE.begin_run()
+            events = iter_scraped_events(sources, concurrent=concurrent, max_workers=max_workers)
+        else:
+            events = read_ndjson(sys.stdin)
+        if 'clean' in stages:
+            events = iter_clean_events(events)
+        if 'enrich' in stages:
+            events = iter_enriched_events(events)
+        if 'categorize' in stages:
+            events = iter_categorized_events(events)
+
+        count = 0
+        for event in events:
+            out.write(json.dumps(event, ensure_ascii=False) + '\n')
+            out.flush()
+            count += 1
+        if 'scrape' in stages:
+            get_breaker().save()
+            if EVENT_STORE is not None:
+                finish_store_run()
+        write_metrics()
+        print(f"✅ Wrote {count} events ({', '.join(stage for stage in NDJSON_STAGES if stage in stages)})")
+
+# Sharded output for the static site: compact JSON per category and date
+# window, each also gzip- and brotli-compressed, under content-hashed names
+OUTPUT_DIR = 'events'
+DATE_WINDOW_DAYS = 7
+
+def configure_output(output_dir=OUTPUT_DIR):
+    """Set the directory for sharded output; None skips writing shards."""
+    global OUTPUT_DIR
+    OUTPUT_DIR = output_dir
+
+def _window_start(day):
+    """First day of the DATE_WINDOW_DAYS window holding an ISO day.
+
+    Windows are counted from a Monday, so 7-day windows are calendar weeks.
+    """
+    day = date.fromisoformat(day)
+    return day - timedelta(days=(day.toordinal() - 1) % DATE_WINDOW_DAYS)
+
+def shard_events(events, featured):
+    """Group events into shards: featured, one per category and one per date window."""
+    shards = {'featured': list(featured)}
+    for event in events:
+        for category in event.get('categories', []):
+            shards.setdefault(f"category-{category}", []).append(event)
+        if event.get('start'):
+            window = _window_start(event['start'][:10]).isoformat()
+            shards.setdefault(f"week-{window}", []).append(event)
+        else:
+            shards.setdefault('undated', []).append(event)
+    return shards
+
+def _write_file(path, data):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def write_artifact(output_dir, name, payload):
+    """Write compact JSON plus .gz and .br copies named by content hash.
+
+    Returns the manifest entry for the artifact. Files that already exist
+    are left alone, as identical names mean identical content.
+    """
+    data = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    digest = hashlib.sha256(data).hexdigest()
+    filename = f"{name}.{digest[:12]}.json"
+
+    variants = {'json': (filename, lambda: data),
+                'gzip': (f"{filename}.gz", lambda: gzip.compress(data, compresslevel=9, mtime=0))}
+    if brotli is not None:
+        variants['br'] = (f"{filename}.br", lambda: brotli.compress(data, quality=11))
+
+    entry = {'sha256': digest}
+    for kind, (variant, compress) in variants.items():
+        path = os.path.join(output_dir, variant)
+        if not os.path.exists(path):
+            _write_file(path, compress())
+        entry[kind] = variant
+        entry[f"{kind}_bytes"] = os.path.getsize(path)
+    return entry
+
+def _manifest_files(manifest):
+    files = set()
+    for entry in manifest.get('shards', {}).values():
+        files.update(entry[kind] for kind in ('json', 'gzip', 'br') if kind in entry)
+    return files
+
+def write_shards(events, featured, output_dir=OUTPUT_DIR):
+    """Write every shard and a manifest.json pointing at the current files.
+
+    Files the previous manifest pointed at are kept for one more run under
+    'retired', so clients holding the old manifest can still finish loading,
+    and removed on the run after. Nothing else in output_dir is touched.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    manifest_path = os.path.join(output_dir, 'manifest.json')
+    try:
+        with open(manifest_path, encoding='utf-8') as f:
+            previous = json.load(f)
+    except (OSError, ValueError):
+        previous = {}
+
+    manifest = {
+        'last_updated': datetime.now().isoformat(),
+        'date_window_days': DATE_WINDOW_DAYS,
+        'shards': {},
+    }
+    for name, shard in sorted(shard_events(events, featured).items()):
+        payload = {'shard': name, 'events': shard, 'date_index': build_date_index(shard)}
+        entry = write_artifact(output_dir, name, payload)
+        entry['events'] = len(shard)
+        manifest['shards'][name] = entry
+
+    current = _manifest_files(manifest)
+    retiring = _manifest_files(previous) - current
+    manifest['retired'] = sorted(retiring)
+    _write_file(manifest_path, json.dumps(manifest, ensure_ascii=False, indent=1).encode('utf-8'))
+
+    # only files an earlier manifest listed as ours, never directories
+    for filename in set(previous.get('retired', [])) - current - retiring:
+        path = os.path.join(output_dir, os.path.basename(filename))
+        if os.path.isfile(path):
+            os.remove(path)
+    return manifest
+
+# Run report of the metrics above, as JSON and as a Prometheus textfile
+METRICS_REPORT = 'aarhus_sustainability_events.report.json'
+PROMETHEUS_TEXTFILE = None
+
+def configure_metrics(report=METRICS_REPORT, prometheus=None):
+    """Set where write_metrics() writes; None skips that format."""
+    global METRICS_REPORT, PROMETHEUS_TEXTFILE
+    METRICS_REPORT = report
+    PROMETHEUS_TEXTFILE = prometheus
+
+def run_report():
+    """Metrics of this run with derived keyword match rates and cache ratios."""
+    sources = run_metrics()
+    for stages in sources.values():
+        classify = stages.get('classify')
+        if classify:
+            classify['match_rate'] = (classify['relevant'] / classify['candidates']
+                                      if classify['candidates'] else 0.0)
+    return {
+        'generated': datetime.now().isoformat(),
+        'sources': sources,
+        'connections': connection_stats(),
+        'cache': cache_stats(),
+    }
+
+def _prometheus_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def prometheus_text(report):
+    """Render a run report in the Prometheus text exposition format."""
+    samples = {}
+    for source, stages in report['sources'].items():
+        for stage, values in stages.items():
+            for name, value in values.items():
+                samples.setdefault(f"aarhus_events_{stage}_{name}", []).append((source, value))
+    for source, counts in report['cache'].items():
+        for name in ('hits', 'misses', 'hit_ratio'):
+            samples.setdefault(f"aarhus_events_cache_{name}", []).append((source, counts[name]))
+
+    lines = []
+    for metric, values in sorted(samples.items()):
+        lines.append(f"# TYPE {metric} gauge")
+        for source, value in sorted(values):
+            lines.append(f'{metric}{{source="{_prometheus_label(source)}"}} {value}')
+    for name, value in sorted(report['connections'].items()):
+        lines.append(f"# TYPE aarhus_events_http_{name} gauge")
+        lines.append(f"aarhus_events_http_{name} {value}")
+    lines.append("# TYPE aarhus_events_report_timestamp_seconds gauge")
+    lines.append(f"aarhus_events_report_timestamp_seconds {time.time():.3f}")
+    return '\n'.join(lines) + '\n'
+
+def write_metrics():
+    """Write the run report where configure_metrics() said."""
+    if not METRICS_REPORT and not PROMETHEUS_TEXTFILE:
+        return None
+    report = run_report()
+    if METRICS_REPORT:
+        _write_file(METRICS_REPORT, json.dumps(report, ensure_ascii=False, indent=2).encode('utf-8'))
+        print(f"📈 Run report saved to '{METRICS_REPORT}'")
+    if PROMETHEUS_TEXTFILE:
+        # Written via rename, as the node_exporter textfile collector expects
+        _write_file(PROMETHEUS_TEXTFILE, prometheus_text(report).encode('utf-8'))
+    return report
+
+def collect_events(sources, concurrent=True, max_workers=MAX_WORKERS):
+    """Scrape sources as one event-store run and report fetch statistics."""
+    if EVENT_STORE is not None:
+        EVENT_STORE.begin_run()
+    started = time.monotonic()
+    all_events = scrape_all(sources, concurrent=concurrent, max_workers=max_workers)
+    record_metric('all', 'scrape', seconds=time.monotonic() - started, events=len(all_events))
+    print(f"⏱️ Fetched all sources in {time.monotonic() - started:.1f}s")
+    stats = connection_stats()
+    print(f"🔌 {stats['requests']} requests over {stats['connections']} connections "
+          f"({stats['reused']} reused)")
+    for source_name, counts in stream_stats().items():
+        if counts['stopped_early']:
+            print(f"✂️ {source_name}: stopped after {counts['bytes_read']} bytes")
+    for source_name, counts in cache_stats().items():
+        print(f"🗄️ {source_name}: {counts['hits']}/{counts['hits'] + counts['misses']} "
+              f"cache hits ({counts['hit_ratio']:.0%})")
+    breaker = get_breaker()
+    breaker.save()
+    if breaker.open_hosts():
+        print(f"🚧 Skipping failing hosts: {', '.join(breaker.open_hosts())}")
+    if EVENT_STORE is not None:
+        finish_store_run()
+    return all_events
+
+def build_events(all_events, include_pdf=True):
+    """Add the PDF events, then clean, enrich, categorize and sort chronologically."""
+    if include_pdf:
+        # Add events from PDF analysis
+        print("📄 Adding events from PDF analysis...")
+        pdf_events = extract_events_from_pdf()
+        all_events = all_events + pdf_events
+        print(f"   Added {len(pdf_events)} events from PDF")
     
     # Clean and deduplicate
     print("🧹 Cleaning and deduplicating events...")
+    started = time.monotonic()
     cleaned_events = clean_and_deduplicate_events(all_events)
+    record_metric('all', 'clean', seconds=time.monotonic() - started)
+    print(f"   Merged {len(all_events) - len(cleaned_events)} duplicate listings")
+    
+    if ENRICH_DETAILS:
+        print("🔎 Enriching events from their detail pages...")
+        started = time.monotonic()
+        cleaned_events = list(iter_enriched_events(cleaned_events))
+        record_metric('all', 'enrich', seconds=time.monotonic() - started)
+        counts = ', '.join(f"{count} {result}" for result, count in sorted(detail_stats().items()))
+        print(f"   Detail pages in {time.monotonic() - started:.1f}s ({counts or 'none needed'})")
     
     # Categorize events
     print("🏷️ Categorizing events...")
-    categorized_events = []
-    for event in cleaned_events:
-        categorized_events.append(categorize_event(event))
-    
-    # Sort by date (put events with actual dates first)
-    def sort_key(event):
-        date_text = event.get('date', '').lower()
-        if 'i dag' in date_text or 'today' in date_text:
-            return (0, date_text)
-        elif 'i morgen' in date_text or 'tomorrow' in date_text:
-            return (1, date_text)
-        else:
-            return (2, date_text)
-    
-    categorized_events.sort(key=sort_key)
+    started = time.monotonic()
+    categorized_events = list(iter_categorized_events(cleaned_events))
     
+    # Sort chronologically by the parsed start, undated events after upcoming ones
+    categorized_events.sort(key=chronological_key)
+    record_metric('all', 'categorize', seconds=time.monotonic() - started)
+    return categorized_events
+
+def output_path(region=DEFAULT_REGION):
+    """File name of a region's output, e.g. aarhus_sustainability_events.json."""
+    return f"{region}_sustainability_events.json"
+
+def output_dir(region=DEFAULT_REGION):
+    """Shard directory of a region; the default region keeps OUTPUT_DIR itself."""
+    if not OUTPUT_DIR or region == DEFAULT_REGION:
+        return OUTPUT_DIR
+    return f"{OUTPUT_DIR}-{region}"
+
+def write_output(categorized_events, sources, max_events=15, region=DEFAULT_REGION):
+    """Write the JSON file and shards for the static site; return the featured events."""
+    started = time.monotonic()
+    path = output_path(region)
+    shard_dir = output_dir(region)
+    source_names = [source['name'] for source in sources]
+    if region == DEFAULT_REGION:
+        source_names.append('Facebook (PDF analysis)')
     # Limit to max 15 events
-    final_events = categorized_events[:15]
+    final_events = categorized_events[:max_events]
     
     # Create output structure
     output = {
         'metadata': {
             'last_updated': datetime.now().isoformat(),
             'total_events': len(final_events),
-            'sources': [source[0] for source in sources] + ['Facebook (PDF analysis)']
+            'region': region,
+            'sources': source_names
         },
-        'events': final_events
+        'events': final_events,
+        'date_index': build_date_index(final_events)
     }
     
     # Save to JSON file
-    with open('aarhus_sustainability_events.json', 'w', encoding='utf-8') as f:
+    with open(path, 'w', encoding='utf-8') as f:
         json.dump(output, f, ensure_ascii=False, indent=2)
     
+    if shard_dir:
+        manifest = write_shards(categorized_events, final_events, shard_dir)
+        compressed = sum(entry.get('br_bytes', entry['gzip_bytes']) for entry in manifest['shards'].values())
+        print(f"🗂️  Wrote {len(manifest['shards'])} shards to '{shard_dir}/' "
+              f"({compressed // 1024} KiB compressed)")
+    record_metric('all', 'output', seconds=time.monotonic() - started, events=len(categorized_events))
+    
     print("=" * 50)
     print(f"✅ Successfully scraped {len(final_events)} sustainability events!")
-    print(f"📁 Saved to 'aarhus_sustainability_events.json'")
+    print(f"📁 Saved to '{path}'")
     
     # Print summary
     print("\n📊 Summary by category:")
@@ -803,8 +2584,530 @@ def main():
     
     for category, count in sorted(categories_count.items()):
         print(f"  {category}: {count} events")
+    return final_events
+
+# Combined file listing every region's output when several regions are run
+COMBINED_OUTPUT = 'all_regions_sustainability_events.json'
+
+def source_regions(sources):
+    """Regions of the given sources, in catalogue order."""
+    return list(dict.fromkeys(source.get('region', DEFAULT_REGION) for source in sources))
+
+def write_region_outputs(all_events, sources, max_events=15):
+    """Build and write one output per region; return {region: featured events}.
+
+    With more than one region, COMBINED_OUTPUT also lists every region's
+    file and merges their featured events in chronological order.
+    """
+    by_region = {region: [] for region in source_regions(sources)}
+    for event in all_events:
+        by_region.setdefault(event.get('region', DEFAULT_REGION), []).append(event)
+
+    featured = {}
+    for region, events in by_region.items():
+        if len(by_region) > 1:
+            print(f"🗺️ {region}: {len(events)} events")
+        region_sources = [source for source in sources
+                          if source.get('region', DEFAULT_REGION) == region]
+        featured[region] = write_output(build_events(events, include_pdf=region == DEFAULT_REGION),
+                                        region_sources, max_events, region)
+
+    if len(featured) > 1:
+        events = sorted((event for region_events in featured.values() for event in region_events),
+                        key=chronological_key)
+        combined = {
+            'metadata': {
+                'last_updated': datetime.now().isoformat(),
+                'total_events': len(events),
+                'regions': {region: {'file': output_path(region), 'total_events': len(region_events)}
+                            for region, region_events in featured.items()},
+            },
+            'events': events,
+            'date_index': build_date_index(events),
+        }
+        with open(COMBINED_OUTPUT, 'w', encoding='utf-8') as f:
+            json.dump(combined, f, ensure_ascii=False, indent=2)
+        print(f"🧩 Merged {len(featured)} regions into '{COMBINED_OUTPUT}'")
+    return featured
+
+def main(concurrent=True, max_workers=MAX_WORKERS, sources=SOURCES):
+    print("🚀 Starting Aarhus Sustainability Events Scraper...")
+    print("=" * 50)
+    
+    reset_metrics()
+    all_events = collect_events(sources, concurrent=concurrent, max_workers=max_workers)
+    print("=" * 50)
+    
+    write_region_outputs(all_events, sources)
+    write_metrics()
     
     print("\n🌱 Ready to use in your static website!")
 
+# Daemon mode: every source is polled on its own interval, which shortens
+# when the source's events change and grows while they stay the same
+DAEMON_START_INTERVAL = 60 * 60
+DAEMON_MIN_INTERVAL = 15 * 60
+DAEMON_MAX_INTERVAL = 24 * 60 * 60
+INTERVAL_SPEEDUP = 0.5      # interval factor after a poll that found changes
+INTERVAL_BACKOFF = 1.5      # interval factor after a poll that found none
+
+def _schedule_path():
+    return os.path.join(CACHE_DIR or '.', 'daemon_schedule.json')
+
+def load_schedule():
+    """Per-source polling state saved by the daemon, or {} on first start."""
+    try:
+        with open(_schedule_path(), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_schedule(schedule):
+    path = _schedule_path()
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    _write_file(path, json.dumps(schedule, ensure_ascii=False).encode('utf-8'))
+
+def events_fingerprint(events):
+    """Hash of a source's events that ignores their order."""
+    hashes = sorted(event_content_hash(event) for event in events)
+    return hashlib.sha256(''.join(hashes).encode('ascii')).hexdigest()
+
+def next_interval(interval, changed, min_interval=DAEMON_MIN_INTERVAL, max_interval=DAEMON_MAX_INTERVAL):
+    """Shorten the polling interval after a change, lengthen it otherwise."""
+    interval *= INTERVAL_SPEEDUP if changed else INTERVAL_BACKOFF
+    return min(max_interval, max(min_interval, interval))
+
+def poll_sources(due, schedule, concurrent=True, max_workers=MAX_WORKERS,
+                 min_interval=DAEMON_MIN_INTERVAL, max_interval=DAEMON_MAX_INTERVAL):
+    """Scrape the due sources and reschedule them; return the names that changed.
+
+    Sources whose fetch failed or was skipped in this run's metrics keep
+    their previous events, so reset_metrics() must be called first.
+    """
+    by_source = {source['name']: [] for source in due}
+    for event in collect_events(due, concurrent=concurrent, max_workers=max_workers):
+        by_source.setdefault(event['source'], []).append(event)
+
+    now = time.time()
+    metrics = run_metrics()
+    changed = []
+    for name, events in by_source.items():
+        state = schedule.setdefault(name, {'interval': DAEMON_START_INTERVAL})
+        fetch = metrics.get(name, {}).get('fetch', {})
+        if fetch.get('errors') or fetch.get('skipped'):
+            # Keep the previous events and interval; an empty listing is not a failure
+            state['next_run'] = now + state['interval']
+            continue
+        fingerprint = events_fingerprint(events)
+        if 'fingerprint' in state:
+            source_changed = fingerprint != state['fingerprint']
+            state['interval'] = next_interval(state['interval'], source_changed,
+                                              min_interval, max_interval)
+        else:
+            source_changed = True
+        if source_changed:
+            changed.append(name)
+            state['last_changed'] = datetime.now().isoformat()
+        state.update(fingerprint=fingerprint, events=events, next_run=now + state['interval'])
+    return changed
+
+def run_daemon(sources=SOURCES, concurrent=True, max_workers=MAX_WORKERS,
+               min_interval=DAEMON_MIN_INTERVAL, max_interval=DAEMON_MAX_INTERVAL, max_cycles=None):
+    """Keep polling sources on adaptive intervals and rewrite the output on changes.
+
+    The schedule and the last events of every source are saved in the cache
+    directory, so a restarted daemon continues where it left off.
+    """
+    print("🚀 Starting Aarhus Sustainability Events Scraper daemon...")
+    schedule = load_schedule()
+    needs_output = not all(os.path.exists(output_path(region)) for region in source_regions(sources))
+    cycles = 0
+    try:
+        while max_cycles is None or cycles < max_cycles:
+            cycles += 1
+            now = time.time()
+            due = [source for source in sources
+                   if schedule.get(source['name'], {}).get('next_run', 0) <= now]
+            if due:
+                print("=" * 50)
+                print(f"🔄 Polling {', '.join(source['name'] for source in due)}")
+                reset_metrics()
+                changed = poll_sources(due, schedule, concurrent, max_workers,
+                                       min_interval, max_interval)
+                if changed or needs_output:
+                    print(f"✏️ Changed: {', '.join(changed) or 'none'}; rewriting output")
+                    all_events = [event for source in sources
+                                  for event in schedule.get(source['name'], {}).get('events', [])]
+                    write_region_outputs(copy.deepcopy(all_events), sources)
+                    needs_output = False
+                else:
+                    print("💤 Nothing changed; output left as is")
+                save_schedule(schedule)
+                write_metrics()
+
+            if max_cycles is not None and cycles >= max_cycles:
+                break
+            name, next_run = min(((source['name'], schedule[source['name']]['next_run'])
+                                  for source in sources), key=lambda item: item[1])
+            wait = max(1.0, next_run - time.time())
+            print(f"⏰ Next poll: {name} in {wait / 60:.0f} min")
+            time.sleep(wait)
+    except KeyboardInterrupt:
+        print("\n👋 Stopping daemon")
+        save_schedule(schedule)
+
+# Partitioned runs: sources go into a SQLite work queue that several worker
+# processes drain, then the per-region results are merged into the outputs
+QUEUE_PATH = 'scraper_queue.sqlite'
+JOB_LEASE = 5 * 60          # seconds before a claimed job counts as abandoned
+JOB_ATTEMPTS = 3            # tries per source before it is marked failed
+
+class WorkQueue:
+    """A persistent queue of sources to scrape, shared between processes.
+
+    Workers claim one job of a batch at a time inside an IMMEDIATE
+    transaction, so two processes never get the same source. A job claimed
+    longer than JOB_LEASE ago is handed out again, which covers crashed
+    workers, until it has used its attempts. Jobs are keyed by host: a job
+    is not handed out while another worker holds a job on the same host,
+    or within HOST_DELAY of one finishing, so politeness holds across
+    processes. The queue also carries circuit breaker changes between
+    workers.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS batches (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            started TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            batch_id INTEGER NOT NULL,
+            region TEXT NOT NULL,
+            source TEXT NOT NULL,
+            state TEXT NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            worker TEXT,
+            claimed_at REAL,
+            events TEXT,
+            error TEXT
+        );
+        CREATE INDEX IF NOT EXISTS jobs_by_state ON jobs (state, id);
+        CREATE TABLE IF NOT EXISTS hosts (
+            host TEXT PRIMARY KEY,
+            released_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS breakers (
+            host TEXT PRIMARY KEY,
+            state TEXT
+        );
+    """
+
+    def __init__(self, path=QUEUE_PATH):
+        self.path = path
+        self._db = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(self.SCHEMA)
+        columns = [row[1] for row in self._db.execute("PRAGMA table_info(jobs)")]
+        if 'host' not in columns:
+            self._db.execute("ALTER TABLE jobs ADD COLUMN host TEXT NOT NULL DEFAULT ''")
+
+    def close(self):
+        self._db.close()
+
+    def enqueue(self, sources):
+        """Add one job per source as a new batch and return the batch id."""
+        self._db.execute("BEGIN IMMEDIATE")
+        batch_id = self._db.execute("INSERT INTO batches (started) VALUES (?)",
+                                    (datetime.now().isoformat(),)).lastrowid
+        self._db.executemany(
+            "INSERT INTO jobs (batch_id, region, host, source) VALUES (?, ?, ?, ?)",
+            [(batch_id, source.get('region', DEFAULT_REGION), urlparse(source['url']).netloc,
+              json.dumps(source, ensure_ascii=False))
+             for source in sources])
+        self._db.execute("COMMIT")
+        return batch_id
+
+    def latest_batch(self):
+        row = self._db.execute("SELECT MAX(id) FROM batches").fetchone()
+        return row[0]
+
+    def claim(self, worker, batch_id, lease=JOB_LEASE, attempts=JOB_ATTEMPTS):
+        """Take the oldest pending or abandoned job of a batch whose host is free.
+
+        Returns (job id, source), or None when nothing can be claimed now.
+        Abandoned jobs that have used all their attempts are marked failed.
+        """
+        now = time.time()
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            self._db.execute(
+                "UPDATE jobs SET state = 'failed', error = 'worker lost too often' "
+                "WHERE batch_id = ? AND state = 'running' AND claimed_at < ? AND attempts >= ?",
+                (batch_id, now - lease, attempts))
+            row = self._db.execute(
+                "SELECT id, source FROM jobs AS j WHERE batch_id = ? "
+                "AND (state = 'pending' OR (state = 'running' AND claimed_at < ?)) "
+                "AND NOT EXISTS (SELECT 1 FROM jobs AS other WHERE other.host = j.host "
+                "    AND other.id != j.id AND other.state = 'running' AND other.claimed_at >= ?) "
+                "AND NOT EXISTS (SELECT 1 FROM hosts WHERE hosts.host = j.host "
+                "    AND hosts.released_at > ?) "
+                "ORDER BY id LIMIT 1",
+                (batch_id, now - lease, now - lease, now - HOST_DELAY)).fetchone()
+            if row is not None:
+                self._db.execute(
+                    "UPDATE jobs SET state = 'running', worker = ?, claimed_at = ?, "
+                    "attempts = attempts + 1 WHERE id = ?", (worker, now, row[0]))
+        finally:
+            self._db.execute("COMMIT")
+        return None if row is None else (row[0], json.loads(row[1]))
+
+    def _release_host(self, job_id):
+        self._db.execute(
+            "INSERT INTO hosts (host, released_at) SELECT host, ? FROM jobs WHERE id = ? "
+            "ON CONFLICT (host) DO UPDATE SET released_at = excluded.released_at",
+            (time.time(), job_id))
+
+    def complete(self, job_id, events):
+        self._db.execute("BEGIN IMMEDIATE")
+        self._db.execute("UPDATE jobs SET state = 'done', events = ?, error = NULL WHERE id = ?",
+                         (json.dumps(events, ensure_ascii=False), job_id))
+        self._release_host(job_id)
+        self._db.execute("COMMIT")
+
+    def fail(self, job_id, error, attempts=JOB_ATTEMPTS):
+        """Put a job back in the queue, or mark it failed after its last attempt."""
+        self._db.execute("BEGIN IMMEDIATE")
+        self._db.execute(
+            "UPDATE jobs SET state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+            "error = ? WHERE id = ?", (attempts, str(error), job_id))
+        self._release_host(job_id)
+        self._db.execute("COMMIT")
+
+    def share_breaker(self, breaker):
+        """Publish breaker's changes and adopt every other worker's."""
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            self._db.executemany(
+                "INSERT INTO breakers (host, state) VALUES (?, ?) "
+                "ON CONFLICT (host) DO UPDATE SET state = excluded.state",
+                [(host, None if state is None else json.dumps(state))
+                 for host, state in breaker.take_changes().items()])
+            states = {host: None if state is None else json.loads(state)
+                      for host, state in self._db.execute("SELECT host, state FROM breakers")}
+        finally:
+            self._db.execute("COMMIT")
+        breaker.merge(states)
+
+    def progress(self, batch_id):
+        """Number of jobs in each state for a batch."""
+        return dict(self._db.execute(
+            "SELECT state, COUNT(*) FROM jobs WHERE batch_id = ? GROUP BY state", (batch_id,)))
+
+    def results(self, batch_id):
+        """Events of every finished job in a batch, in queue order."""
+        events = []
+        for (encoded,) in self._db.execute(
+                "SELECT events FROM jobs WHERE batch_id = ? AND state = 'done' ORDER BY id",
+                (batch_id,)):
+            events.extend(json.loads(encoded))
+        return events
+
+def worker_settings():
+    """Module settings a spawned worker process needs to behave like this one."""
+    return {
+        'cache_dir': CACHE_DIR,
+        'parser': PARSER_BACKEND,
+        'subtree': PARSE_SUBTREE,
+        'source_budget': SOURCE_BUDGET,
+        'retries': MAX_RETRIES,
+        'host_delay': HOST_DELAY,
+        'regions': REGIONS,
+    }
+
+def run_worker(queue_path=QUEUE_PATH, worker=None, settings=None, lease=JOB_LEASE,
+               batch_id=None):
+    """Scrape sources of a batch (the latest by default) until none are pending.
+
+    Returns the jobs done. Workers do not use the event store, which tracks
+    a single run at a time; the HTTP cache is shared, and circuit breaker
+    changes are exchanged through the queue before being saved.
+    """
+    global HOST_DELAY
+    worker = worker or f"worker-{os.getpid()}"
+    if settings:
+        configure_cache(settings['cache_dir'])
+        configure_parser(settings['parser'], subtree=settings['subtree'])
+        configure_fetch(None, settings['source_budget'], settings['retries'])
+        HOST_DELAY = settings['host_delay']
+        REGIONS.update(settings['regions'])
+    configure_store(None)
+
+    queue = WorkQueue(queue_path)
+    batch_id = batch_id or queue.latest_batch()
+    breaker = get_breaker()
+    done = 0
+    try:
+        while True:
+            queue.share_breaker(breaker)
+            job = queue.claim(worker, batch_id, lease)
+            if job is None:
+                if not queue.progress(batch_id).get('pending'):
+                    break
+                # the remaining jobs are on hosts another worker is fetching
+                time.sleep(max(HOST_DELAY, 0.1))
+                continue
+            job_id, source = job
+            try:
+                events, elapsed = run_scraper(source)
+            except Exception as e:
+                queue.fail(job_id, e)
+                continue
+            if not events and run_metrics().get(source['name'], {}).get('fetch', {}).get('errors'):
+                queue.fail(job_id, f"fetching {source['name']} failed")
+                continue
+            queue.complete(job_id, events)
+            done += 1
+            print(f"📡 [{worker}] {source['name']}: found {len(events)} events in {elapsed:.1f}s")
+        queue.share_breaker(breaker)
+        breaker.save()
+    finally:
+        queue.close()
+    return done
+
+def run_partitioned(sources=SOURCES, workers=4, queue_path=QUEUE_PATH):
+    """Scrape sources with several worker processes and merge the results per region.
+
+    More regions only add queue jobs, so covering them takes more workers
+    rather than more time. Other processes may join with --worker.
+    """
+    print(f"🚀 Starting partitioned run: {len(sources)} sources in "
+          f"{len(source_regions(sources))} regions, {workers} workers")
+    reset_metrics()
+    queue = WorkQueue(queue_path)
+    batch_id = queue.enqueue(sources)
+    started = time.monotonic()
+
+    settings = worker_settings()
+    processes = [_SPAWN.Process(target=run_worker, args=(queue_path, None, settings,
+                                                         JOB_LEASE, batch_id))
+                 for _ in range(workers)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    # Jobs left behind by a crashed worker are finished here
+    progress = queue.progress(batch_id)
+    if progress.get('pending') or progress.get('running'):
+        run_worker(queue_path, lease=0, batch_id=batch_id)
+    breaker = get_breaker()
+    queue.share_breaker(breaker)
+    breaker.save()
+    progress = queue.progress(batch_id)
+    record_metric('all', 'scrape', seconds=time.monotonic() - started)
+    print(f"⏱️ Fetched {progress.get('done', 0)} sources in {time.monotonic() - started:.1f}s "
+          f"({progress.get('failed', 0)} failed)")
+    print("=" * 50)
+
+    all_events = queue.results(batch_id)
+    queue.close()
+    write_region_outputs(all_events, sources)
+    write_metrics()
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Scrape sustainability events in Aarhus")
+    parser.add_argument('--sequential', action='store_true',
+                        help="fetch sources one at a time instead of in parallel")
+    parser.add_argument('--workers', type=int, default=MAX_WORKERS,
+                        help="number of sources fetched in parallel")
+    parser.add_argument('--cache-dir', default=CACHE_DIR,
+                        help="directory for the HTTP response cache")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="always download and parse every source page")
+    parser.add_argument('--parser', choices=['lxml', 'html.parser'],
+                        help=f"HTML parser backend (default: {PARSER_BACKEND})")
+    parser.add_argument('--full-parse', action='store_true',
+                        help="build the whole document instead of listing subtrees")
+    parser.add_argument('--stream', action='store_true',
+                        help="parse listing pages while downloading and stop at the item cap")
+    parser.add_argument('--store', default=STORE_PATH,
+                        help="SQLite event store used for incremental runs")
+    parser.add_argument('--no-store', action='store_true',
+                        help="process every event from scratch and skip the change diff")
+    parser.add_argument('--output-dir', default=OUTPUT_DIR,
+                        help="directory for sharded, precompressed output")
+    parser.add_argument('--no-shards', action='store_true',
+                        help="only write the <region>_sustainability_events.json files")
+    parser.add_argument('--enrich', action='store_true',
+                        help="fill image, organizer, date and time from event detail pages")
+    parser.add_argument('--enrich-workers', type=int, default=ENRICH_WORKERS,
+                        help="detail pages fetched in parallel")
+    parser.add_argument('--enrich-per-host', type=int, default=ENRICH_PER_HOST,
+                        help="detail pages fetched in parallel from one host")
+    parser.add_argument('--ndjson', action='store_true',
+                        help="stream events as NDJSON to stdout instead of writing files")
+    parser.add_argument('--stages', default=','.join(NDJSON_DEFAULT_STAGES),
+                        help="comma-separated NDJSON stages to run; without 'scrape' "
+                             "events are read as NDJSON from stdin")
+    parser.add_argument('--daemon', action='store_true',
+                        help="keep running, polling each source on an adaptive interval")
+    parser.add_argument('--min-interval', type=float, default=DAEMON_MIN_INTERVAL / 60,
+                        help="shortest polling interval per source in daemon mode, in minutes")
+    parser.add_argument('--max-interval', type=float, default=DAEMON_MAX_INTERVAL / 60,
+                        help="longest polling interval per source in daemon mode, in minutes")
+    parser.add_argument('--report', default=METRICS_REPORT,
+                        help="JSON run report with per-source, per-stage metrics")
+    parser.add_argument('--no-report', action='store_true',
+                        help="do not write the JSON run report")
+    parser.add_argument('--prometheus', metavar='PATH',
+                        help="also write the metrics as a Prometheus textfile")
+    parser.add_argument('--deadline', type=float,
+                        help="seconds to fetch all sources; sources still waiting are skipped")
+    parser.add_argument('--source-budget', type=float, default=SOURCE_BUDGET,
+                        help="seconds one source may take, retries included")
+    parser.add_argument('--retries', type=int, default=MAX_RETRIES,
+                        help="retries after connection errors, timeouts and 429/5xx answers")
+    parser.add_argument('--processes', type=int, default=PARSE_PROCESSES,
+                        help="parse and classify pages in this many worker processes "
+                             "while threads keep fetching (0: parse in the fetch threads)")
+    parser.add_argument('--max-pending', type=int, default=MAX_PENDING_PAGES,
+                        help="fetched pages allowed to wait for a parse process")
+    parser.add_argument('--catalogue', metavar='PATH',
+                        help="JSON catalogue of regions and sources to use instead of the built-in ones")
+    parser.add_argument('--regions',
+                        help="comma-separated regions to scrape (default: all)")
+    parser.add_argument('--partitioned', type=int, metavar='WORKERS',
+                        help="scrape through a work queue with this many worker processes")
+    parser.add_argument('--worker', action='store_true',
+                        help="join the latest partitioned run: work through its queue until it is empty")
+    parser.add_argument('--queue', default=QUEUE_PATH,
+                        help="SQLite work queue for partitioned runs")
+    args = parser.parse_args()
+    regions = [region.strip() for region in (args.regions or '').split(',') if region.strip()]
+    configure_catalogue(args.catalogue, regions)
+    configure_pipeline(args.processes, args.max_pending)
+    configure_fetch(args.deadline, args.source_budget, args.retries)
+    configure_metrics(None if args.no_report else args.report, args.prometheus)
+    stages = [stage.strip() for stage in args.stages.split(',') if stage.strip()]
+    unknown = set(stages) - set(NDJSON_STAGES)
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(sorted(unknown))}")
+    if args.enrich and 'enrich' not in stages:
+        stages.append('enrich')
+    configure_enrichment(args.enrich or 'enrich' in stages, args.enrich_workers, args.enrich_per_host)
+    configure_output(None if args.no_shards else args.output_dir)
+    configure_cache(None if args.no_cache else args.cache_dir)
+    configure_store(None if args.no_store else args.store)
+    configure_parser(args.parser, subtree=not args.full_parse, stream=args.stream)
+    if args.worker:
+        run_worker(args.queue)
+    elif args.partitioned:
+        run_partitioned(SOURCES, args.partitioned, args.queue)
+    elif args.daemon:
+        run_daemon(SOURCES, concurrent=not args.sequential, max_workers=args.workers,
+                   min_interval=args.min_interval * 60, max_interval=args.max_interval * 60)
+    elif args.ndjson:
+        run_ndjson(stages, concurrent=not args.sequential, max_workers=args.workers, sources=SOURCES)
+    else:
+        main(concurrent=not args.sequential, max_workers=args.workers, sources=SOURCES)
\ No newline at end of file
@@ -0,0 +1,271 @@
+"""Responsive image variants for the site, built on removebg.py.
+
+Writes each source image at several widths as AVIF (when Pillow can encode
+it), WebP and a PNG fallback (JPEG for opaque photos), and a manifest with
+ready-made srcset strings for <picture> elements.
+
+Icons (the waste-category set by default) have their outer background
+removed first, and the *_no_bg.png outputs of removebg.py are used as
+sources as they are.
+
+Run with: python assetpipeline.py images plastic.jpg
+          python assetpipeline.py images --remove-bg 'images/*logo*' --widths 160,320,640
+"""
+import argparse
+import fnmatch
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from PIL import Image, ImageOps, features
+
+import removebg
+from spriteatlas import WASTE_ICONS
+
+ASSET_DIR = "assets"
+MANIFEST_NAME = "manifest.json"
+WIDTHS = (320, 640, 960, 1280, 1920)
+QUALITY = {"avif": 55, "webp": 80, "jpeg": 82}
+MIME_TYPES = {
+    "avif": "image/avif",
+    "webp": "image/webp",
+    "png": "image/png",
+    "jpeg": "image/jpeg",
+}
+EXTENSIONS = {"avif": "avif", "webp": "webp", "png": "png", "jpeg": "jpg"}
+DEFAULT_SOURCES = ("images", "plastic.jpg")
+REMOVE_BG = WASTE_ICONS
+
+
+def modern_formats():
+    """The modern formats this Pillow build can encode, best first."""
+    return [fmt for fmt in ("avif", "webp") if features.check(fmt)]
+
+
+def variant_widths(width, widths=WIDTHS):
+    """Requested widths below the source width, plus the source width itself."""
+    return sorted({w for w in widths if w < width} | {width})
+
+
+def _has_transparency(img):
+    return img.mode == "RGBA" and img.getextrema()[3][0] < 255
+
+
+def load_source(path, remove_bg=False, threshold=220):
+    """Open a source image upright, as RGBA if it has transparency and RGB otherwise."""
+    img = ImageOps.exif_transpose(Image.open(path))
+    if remove_bg:
+        img = removebg.clear_outer_background(img, threshold)
+    elif img.mode not in ("RGB", "RGBA"):
+        img = img.convert("RGBA")
+    return img if _has_transparency(img) else img.convert("RGB")
+
+
+def _save_variant(img, path, fmt):
+    options = {"quality": QUALITY[fmt]} if fmt in QUALITY else {}
+    if fmt == "jpeg":
+        options.update(optimize=True, progressive=True)
+    elif fmt == "webp":
+        options["method"] = 6
+    tmp = path + ".tmp"
+    img.save(tmp, format=fmt.upper(), **options)
+    os.replace(tmp, path)
+    return os.path.getsize(path)
+
+
+def variant_stems(sources):
+    """Output stem per source, relative to out_dir; sources that would share one keep their extension."""
+    stems = {}
+    for source in sources:
+        relative = os.path.relpath(source)
+        if relative.startswith(".."):
+            relative = os.path.basename(source)
+        stems[source] = os.path.splitext(relative)[0]
+    taken = Counter(stems.values())
+    return {
+        source: stem + "-" + os.path.splitext(source)[1].lstrip(".").lower()
+        if taken[stem] > 1 else stem
+        for source, stem in stems.items()
+    }
+
+
+def _variant_path(out_dir, stem, width, fmt):
+    return os.path.join(out_dir, f"{stem}-{width}w.{EXTENSIONS[fmt]}")
+
+
+def _url(path):
+    return path.replace(os.sep, "/")
+
+
+def build_asset(source, source_hash, out_dir, settings):
+    """Write every variant of one source image and return its manifest entry."""
+    img = load_source(source, settings["remove_bg"], settings["threshold"])
+    transparent = img.mode == "RGBA"
+    fallback = "png" if transparent else "jpeg"
+    formats = settings["formats"] + [fallback]
+
+    variants = {fmt: [] for fmt in formats}
+    for width in variant_widths(img.width, settings["widths"]):
+        height = max(1, round(img.height * width / img.width))
+        resized = img if width == img.width else img.resize((width, height), Image.LANCZOS)
+        for fmt in formats:
+            path = _variant_path(out_dir, settings["stem"], width, fmt)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            size = _save_variant(resized, path, fmt)
+            variants[fmt].append({"path": _url(path), "width": width, "height": height,
+                                  "bytes": size})
+
+    largest = {fmt: files[-1] for fmt, files in variants.items()}
+    return {
+        "source_hash": source_hash,
+        "settings": settings,
+        "source_bytes": os.path.getsize(source),
+        "width": img.width,
+        "height": img.height,
+        "transparent": transparent,
+        "fallback": largest[fallback]["path"],
+        "sources": [
+            {
+                "type": MIME_TYPES[fmt],
+                "srcset": ", ".join(f"{v['path']} {v['width']}w" for v in files),
+                "files": files,
+            }
+            for fmt, files in variants.items()
+        ],
+        "saved_bytes": {
+            fmt: os.path.getsize(source) - v["bytes"] for fmt, v in largest.items()
+        },
+    }
+
+
+def _entry_files(entry):
+    return [v["path"] for group in entry.get("sources", []) for v in group["files"]]
+
+
+def is_current(entry, source_hash, settings):
+    """True when entry was built from this source with these settings and its files exist."""
+    return (
+        entry is not None
+        and entry.get("source_hash") == source_hash
+        and entry.get("settings") == settings
+        and all(os.path.exists(path) for path in _entry_files(entry))
+    )
+
+
+def _remove_stale(old, new):
+    for path in set(_entry_files(old or {})) - set(_entry_files(new)):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def report_savings(manifest, keys):
+    """Print bytes saved per asset by the full-width variants against the original."""
+    total_source = 0
+    total_best = 0
+    for key in keys:
+        entry = manifest[key]
+        source_bytes = entry["source_bytes"]
+        parts = []
+        for fmt, saved in entry["saved_bytes"].items():
+            parts.append(f"{fmt} {(source_bytes - saved) / 1024:.1f} KiB "
+                         f"({-100 * saved / source_bytes:+.0f}%)")
+        total_source += source_bytes
+        total_best += source_bytes - max(entry["saved_bytes"].values())
+        print(f"   {key:40} {source_bytes / 1024:8.1f} KiB -> {', '.join(parts)}")
+    if total_source:
+        print(f"💾 Best variants: {total_best / 1024:.1f} KiB of {total_source / 1024:.1f} KiB "
+              f"originals, {(total_source - total_best) / 1024:.1f} KiB saved")
+
+
+def build_assets(patterns=DEFAULT_SOURCES, out_dir=ASSET_DIR, widths=WIDTHS, remove_bg=REMOVE_BG,
+                 threshold=220, workers=None, force=False):
+    """Build the variants of every matching image in a process pool.
+
+    Sources whose content hash and settings match the manifest are skipped.
+    Images matching a remove_bg pattern get their outer background removed
+    first.
+    """
+    sources = removebg.expand_inputs(patterns, suffix=None)
+    stems = variant_stems(sources)
+    manifest_path = os.path.join(out_dir, MANIFEST_NAME)
+    manifest = removebg.load_manifest(manifest_path)
+    os.makedirs(out_dir, exist_ok=True)
+    formats = modern_formats()
+
+    todo = []
+    for source in sources:
+        settings = {
+            "stem": stems[source],
+            "widths": sorted(widths),
+            "formats": formats,
+            "quality": QUALITY,
+            "remove_bg": any(fnmatch.fnmatch(source, os.path.normpath(p)) for p in remove_bg),
+            "threshold": threshold,
+        }
+        source_hash = removebg.file_hash(source)
+        if force or not is_current(manifest.get(source), source_hash, settings):
+            todo.append((source, source_hash, settings))
+
+    print(f"🖼️  {len(sources)} images, {len(sources) - len(todo)} unchanged, "
+          f"{len(todo)} to build as {', '.join(formats + ['png/jpeg'])}")
+
+    built = []
+    start = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(build_asset, source, source_hash, out_dir, settings): source
+                for source, source_hash, settings in todo
+            }
+            for future in as_completed(futures):
+                source = futures[future]
+                try:
+                    entry = future.result()
+                except Exception as e:
+                    print(f"❌ {source}: {e}")
+                    continue
+                _remove_stale(manifest.get(source), entry)
+                manifest[source] = entry
+                built.append(source)
+    finally:
+        # sources that were deleted take their variants with them
+        for source in [s for s in manifest if not os.path.exists(s)]:
+            _remove_stale(manifest.pop(source), {})
+        removebg.save_manifest(manifest_path, manifest)
+
+    if todo:
+        print(f"🏁 Built {len(built)} images in {time.perf_counter() - start:.2f}s")
+    report_savings(manifest, sorted(built))
+    return manifest
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Write resized AVIF/WebP/PNG variants of images and a srcset manifest"
+    )
+    parser.add_argument("inputs", nargs="*", default=list(DEFAULT_SOURCES),
+                        help="image files, directories or glob patterns "
+                             f"(default: {' '.join(DEFAULT_SOURCES)})")
+    parser.add_argument("--out-dir", default=ASSET_DIR,
+                        help=f"where variants and {MANIFEST_NAME} are written")
+    parser.add_argument("--widths", default=",".join(str(w) for w in WIDTHS),
+                        help="comma-separated variant widths in pixels")
+    parser.add_argument("--remove-bg", action="append", default=None, metavar="PATTERN",
+                        help="remove the outer background of sources matching this glob "
+                             "(can be repeated; default: the waste-category icons)")
+    parser.add_argument("--keep-bg", action="store_true",
+                        help="do not remove the background of any source")
+    parser.add_argument("--threshold", type=int, default=220,
+                        help="channel value above which a pixel counts as background")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: one per CPU)")
+    parser.add_argument("--force", action="store_true",
+                        help="rebuild every image even if the manifest says it is unchanged")
+    args = parser.parse_args()
+
+    build_assets(args.inputs, args.out_dir, [int(w) for w in args.widths.split(",")],
+                 () if args.keep_bg else args.remove_bg or REMOVE_BG,
+                 args.threshold, args.workers, args.force)
@@ -1,21 +1,37 @@
 from PIL import Image
 import numpy as np
-from collections import deque
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import argparse
+import glob
+import hashlib
+import json
+import os
+import sys
+import time
 
+try:
+    from scipy import ndimage
+except ImportError:  # the numpy labelling below gives the same result
+    ndimage = None
 
-def remove_outer_background(input_path, output_path, threshold=220):
-    img = Image.open(input_path).convert("RGBA")
-    data = np.array(img)
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
 
-    h, w = data.shape[:2]
 
+def background_mask(data, threshold=220):
     r = data[:, :, 0]
     g = data[:, :, 1]
     b = data[:, :, 2]
 
     # detect near-white pixels
-    bg = (r > threshold) & (g > threshold) & (b > threshold)
+    return (r > threshold) & (g > threshold) & (b > threshold)
 
+
+def _flood_fill(bg):
+    h, w = bg.shape
     visited = np.zeros((h, w), dtype=bool)
     q = deque()
 
@@ -42,11 +58,363 @@ def remove_outer_background(input_path, output_path, threshold=220):
                     visited[ny, nx] = True
                     q.append((ny, nx))
 
+    return visited
+
+
+def _border_labels(labels, keep):
+    """Mark the labels that occur on the image border where keep is set."""
+    edges = [
+        (labels[0], keep[0]), (labels[-1], keep[-1]),
+        (labels[:, 0], keep[:, 0]), (labels[:, -1], keep[:, -1]),
+    ]
+    return np.concatenate([lab[k] for lab, k in edges])
+
+
+def _union_runs(a, b, n):
+    """Give every run the smallest run id of its connected group."""
+    labels = np.arange(n, dtype=np.int64)
+    while True:
+        la, lb = labels[a], labels[b]
+        differ = la != lb
+        if not differ.any():
+            return labels
+        la, lb = la[differ], lb[differ]
+        # hook the larger root under the smaller one, then flatten
+        np.minimum.at(labels, np.maximum(la, lb), np.minimum(la, lb))
+        while True:
+            jumped = labels[labels]
+            if np.array_equal(jumped, labels):
+                break
+            labels = jumped
+
+
+def _label_runs(bg):
+    """4-connected component labels of bg built from horizontal runs."""
+    h, w = bg.shape
+    edges = np.diff(bg.astype(np.int8), axis=1, prepend=0)
+    starts = edges == 1
+    n = int(starts.sum())
+    if n == 0:
+        return np.zeros((h, w), dtype=np.int64), np.zeros(1, dtype=np.int64)
+
+    # number the runs in row-major order; only pixels inside bg are meaningful
+    run_ids = np.cumsum(starts.ravel(), dtype=np.int64).reshape(h, w) - 1
+
+    # runs in neighbouring rows that share a column are connected; two runs
+    # overlap in a single interval of columns where both rows are set, so the
+    # first column of every such interval gives each pair exactly once
+    both = bg[:-1] & bg[1:]
+    first = both & (np.diff(both.astype(np.int8), axis=1, prepend=0) == 1)
+    labels = _union_runs(run_ids[:-1][first], run_ids[1:][first], n)
+    return run_ids, labels
+
+
+def _label_components(bg):
+    if ndimage is not None:
+        labels, _ = ndimage.label(bg)
+        border = _border_labels(labels, bg)
+        return np.isin(labels, border[border > 0])
+
+    run_ids, labels = _label_runs(bg)
+    outer = np.zeros(len(labels), dtype=bool)
+    outer[labels[_border_labels(run_ids, bg)]] = True
+    return bg & outer[labels][run_ids]
+
+
+def outer_background(bg, method="label"):
+    """Pixels of bg that are 4-connected to the image border.
+
+    method="label" labels connected components with array operations
+    (scipy.ndimage when installed, numpy otherwise); method="bfs" is the
+    original pixel-by-pixel flood fill. Both give the same mask.
+    """
+    if method == "bfs":
+        return _flood_fill(bg)
+    if method == "label":
+        return _label_components(bg)
+    raise ValueError(f"Unknown method {method!r}, expected 'label' or 'bfs'")
+
+
+def _band_labels(bg):
+    """Component labels of bg numbered from 0, with -1 outside bg."""
+    if not bg.any():
+        return np.full(bg.shape, -1, dtype=np.int64), 0
+    if ndimage is not None:
+        labels, n = ndimage.label(bg)
+        return labels.astype(np.int64) - 1, n
+
+    run_ids, run_labels = _label_runs(bg)
+    roots, compact = np.unique(run_labels, return_inverse=True)
+    return np.where(bg, compact[run_ids], -1), len(roots)
+
+
+def _band_boxes(width, height, band_rows):
+    return [(0, y, width, min(y + band_rows, height)) for y in range(0, height, band_rows)]
+
+
+def _clear_outer_background_banded(img, threshold, band_rows):
+    """Zero the alpha of the outer background of an RGBA image, band by band.
+
+    The first pass labels each band and keeps only its edge rows and
+    columns, joining components across band boundaries. The second pass
+    labels each band again and writes its alpha back into img, so no
+    full-size mask or label array is ever held.
+    """
+    width, height = img.size
+    boxes = _band_boxes(width, height, band_rows)
+    none = np.empty(0, dtype=np.int64)
+    above, below, border, offsets = [none], [none], [none], []
+    total = 0
+    previous = None
+
+    for i, box in enumerate(boxes):
+        labels, n = _band_labels(background_mask(np.asarray(img.crop(box)), threshold))
+        labels[labels >= 0] += total
+        top, bottom = labels[0], labels[-1]
+        if previous is not None:
+            joined = (previous >= 0) & (top >= 0)
+            above.append(previous[joined])
+            below.append(top[joined])
+        # copies, so the band's label array can be freed
+        border += [labels[:, 0].copy(), labels[:, -1].copy()]
+        if i == 0:
+            border.append(top.copy())
+        if i == len(boxes) - 1:
+            border.append(bottom.copy())
+        previous = bottom.copy()
+        offsets.append(total)
+        total += n
+
+    roots = _union_runs(np.concatenate(above), np.concatenate(below), total)
+    border = np.concatenate(border)
+    outer = np.zeros(total, dtype=bool)
+    outer[roots[border[border >= 0]]] = True
+    outer = outer[roots]
+
+    for box, offset in zip(boxes, offsets):
+        band = np.array(img.crop(box))
+        labels, _ = _band_labels(background_mask(band, threshold))
+        inside = labels >= 0
+        inside[inside] = outer[labels[inside] + offset]
+        band[inside, 3] = 0
+        img.paste(Image.fromarray(band), box[:2])
+
+
+def _open_rgba(input_path):
+    img = Image.open(input_path)
+    if img.mode == "RGBA":
+        img.load()
+        return img
+    return img.convert("RGBA")
+
+
+def peak_rss_mib(children=False):
+    """Peak resident set size of this process (or its finished children) in MiB."""
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF)
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return usage.ru_maxrss / (1 << 20 if sys.platform == "darwin" else 1 << 10)
+
+
+def clear_outer_background(img, threshold=220, method="label", band_rows=None):
+    """img as RGBA with its outer near-white background made transparent.
+
+    In banded mode an RGBA img is changed in place instead of copied.
+    """
+    if band_rows:
+        # low-memory mode: only the RGBA image is held at full size
+        if method != "label":
+            raise ValueError("Banded processing needs method='label'")
+        if img.mode != "RGBA":
+            img = img.convert("RGBA")
+        _clear_outer_background_banded(img, threshold, band_rows)
+        return img
+
+    data = np.array(img.convert("RGBA"))
+
+    bg = background_mask(data, threshold)
+
     # make only outer background transparent
-    data[visited, 3] = 0
+    data[outer_background(bg, method), 3] = 0
+
+    return Image.fromarray(data)
+
+
+def remove_outer_background(input_path, output_path, threshold=220, method="label",
+                            band_rows=None):
+    img = _open_rgba(input_path) if band_rows else Image.open(input_path)
+    clear_outer_background(img, threshold, method, band_rows).save(output_path)
+
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp")
+OUTPUT_SUFFIX = "_no_bg"
+MANIFEST_PATH = "removebg_manifest.json"
+LOW_MEMORY_BAND_ROWS = 256
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def expand_inputs(patterns, suffix=OUTPUT_SUFFIX):
+    """Image files named by directories, globs or plain paths.
+
+    Files whose name ends in suffix (our own outputs) are skipped unless
+    suffix is None.
+    """
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            found = [os.path.join(pattern, name) for name in os.listdir(pattern)]
+        elif glob.has_magic(pattern):
+            found = glob.glob(pattern, recursive=True)
+        else:
+            found = [pattern]
+        for path in sorted(found):
+            stem, ext = os.path.splitext(os.path.basename(path))
+            if ext.lower() in IMAGE_EXTENSIONS and not (suffix and stem.endswith(suffix)):
+                paths.append(os.path.normpath(path))
+    return list(dict.fromkeys(paths))
+
+
+def output_for(input_path, out_dir=None, suffix=OUTPUT_SUFFIX, keep_ext=False):
+    stem, ext = os.path.splitext(os.path.basename(input_path))
+    if keep_ext:
+        stem += "-" + ext.lstrip(".").lower()
+    return os.path.join(out_dir or os.path.dirname(input_path), stem + suffix + ".png")
+
+
+def output_paths(inputs, out_dir=None):
+    """Output path per input; inputs that would share one keep their extension."""
+    outputs = {path: output_for(path, out_dir) for path in inputs}
+    taken = Counter(outputs.values())
+    return {
+        path: output_for(path, out_dir, keep_ext=True) if taken[output] > 1 else output
+        for path, output in outputs.items()
+    }
+
+
+def load_manifest(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(path, manifest):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def is_current(entry, input_hash, output_path, threshold):
+    """True when the manifest says output_path was made from this input and threshold."""
+    return (
+        entry is not None
+        and entry.get("input_hash") == input_hash
+        and entry.get("threshold") == threshold
+        and entry.get("output") == output_path
+        and os.path.exists(output_path)
+        and file_hash(output_path) == entry.get("output_hash")
+    )
+
+
+def _process_image(input_path, output_path, threshold, method, band_rows):
+    remove_outer_background(input_path, output_path, threshold, method, band_rows)
+    return file_hash(output_path)
+
+
+def remove_backgrounds(patterns, threshold=220, method="label", out_dir=None,
+                       workers=None, manifest_path=MANIFEST_PATH, force=False,
+                       band_rows=None):
+    """Remove the outer background of every matching image in a process pool.
+
+    Images whose content hash and threshold match the manifest, and whose
+    output is still the one we wrote, are skipped.
+    """
+    inputs = expand_inputs(patterns)
+    outputs = output_paths(inputs, out_dir)
+    manifest = load_manifest(manifest_path)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+
+    todo = []
+    for path in inputs:
+        input_hash = file_hash(path)
+        output_path = outputs[path]
+        if force or not is_current(manifest.get(path), input_hash, output_path, threshold):
+            todo.append((path, input_hash, output_path))
+
+    print(f"🖼️  {len(inputs)} images, {len(inputs) - len(todo)} unchanged, {len(todo)} to process")
+    if not todo:
+        return manifest
+
+    failed = 0
+    start = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(_process_image, path, output_path, threshold, method, band_rows):
+                    (path, input_hash, output_path)
+                for path, input_hash, output_path in todo
+            }
+            for future in as_completed(futures):
+                path, input_hash, output_path = futures[future]
+                try:
+                    output_hash = future.result()
+                except Exception as e:
+                    failed += 1
+                    manifest.pop(path, None)
+                    print(f"❌ {path}: {e}")
+                    continue
+                manifest[path] = {
+                    "input_hash": input_hash,
+                    "threshold": threshold,
+                    "output": output_path,
+                    "output_hash": output_hash,
+                }
+                print(f"✅ {path} -> {output_path}")
+    finally:
+        save_manifest(manifest_path, manifest)
+
+    print(f"🏁 Processed {len(todo) - failed} images in {time.perf_counter() - start:.2f}s"
+          + (f", {failed} failed" if failed else ""))
+    peak = peak_rss_mib(children=True)
+    if peak is not None:
+        print(f"📈 Peak RSS: {peak:.0f} MiB per worker, {peak_rss_mib():.0f} MiB main process")
+    return manifest
 
-    Image.fromarray(data).save(output_path)
 
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Make the outer near-white background of images transparent"
+    )
+    parser.add_argument("inputs", nargs="+",
+                        help="image files, directories or glob patterns")
+    parser.add_argument("--threshold", type=int, default=220,
+                        help="channel value above which a pixel counts as background")
+    parser.add_argument("--method", choices=("label", "bfs"), default="label",
+                        help="connected-component labelling or the pixel flood fill")
+    parser.add_argument("--out-dir", default=None,
+                        help="write outputs here instead of next to each input")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: one per CPU)")
+    parser.add_argument("--manifest", default=MANIFEST_PATH,
+                        help="manifest of input and output hashes used to skip unchanged images")
+    parser.add_argument("--force", action="store_true",
+                        help="process every image even if the manifest says it is unchanged")
+    parser.add_argument("--low-memory", nargs="?", type=int, const=LOW_MEMORY_BAND_ROWS,
+                        default=None, metavar="ROWS",
+                        help="work through each image in bands of ROWS rows "
+                             f"(default {LOW_MEMORY_BAND_ROWS}) to keep peak memory down")
+    args = parser.parse_args()
 
-# example usage
-remove_outer_background("images/farlig.png","images/farlig_no_bg.png")
\ No newline at end of file
+    remove_backgrounds(args.inputs, args.threshold, args.method, args.out_dir,
+                       args.workers, args.manifest, args.force, args.low_memory)
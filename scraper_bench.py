@@ -0,0 +1,437 @@
+"""Benchmarks for EventScraper.py.
+
+Run with: python scraper_bench.py keywords --texts 5000
+          python scraper_bench.py extract --items 500
+          python scraper_bench.py record --pages bench_pages
+          python scraper_bench.py parse --pages bench_pages
+          python scraper_bench.py run --pages bench_pages --latency 200 --drip 64
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+
+import EventScraper
+
+FILLER_WORDS = [
+    'aarhus', 'koncert', 'musik', 'aften', 'familie', 'børn', 'gratis', 'entré',
+    'udstilling', 'byen', 'weekend', 'sammen', 'oplev', 'hygge', 'marked', 'fest',
+    'teater', 'dans', 'mad', 'kaffe', 'kage', 'foredrag', 'billetter', 'åbent',
+    'hus', 'lørdag', 'søndag', 'kl.', 'event', 'tilmelding', 'nye', 'venner',
+]
+
+def make_event_texts(count, seed=42):
+    """Generate event-like 'title description' strings, some with keywords."""
+    rng = random.Random(seed)
+    keywords = EventScraper.SUSTAINABILITY_KEYWORDS
+    texts = []
+    for _ in range(count):
+        words = rng.choices(FILLER_WORDS, k=rng.randint(20, 60))
+        if rng.random() < 0.3:
+            words.insert(rng.randrange(len(words)), rng.choice(keywords))
+        text = ' '.join(words)
+        texts.append(text.capitalize())
+    return texts
+
+def linear_scan(text):
+    """The original per-keyword substring scan, kept as a reference."""
+    if not text:
+        return False
+    text_lower = text.lower()
+    for keyword in EventScraper.SUSTAINABILITY_KEYWORDS:
+        if keyword.lower() in text_lower:
+            return True
+    return False
+
+def _time(func, texts, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = [func(text) for text in texts]
+        best = min(best, time.perf_counter() - start)
+    return best, results
+
+def bench_keywords(count=5000, repeat=3):
+    """Compare the keyword matcher with the original linear scan."""
+    texts = make_event_texts(count)
+    matcher = EventScraper.SUSTAINABILITY_MATCHER
+
+    linear_time, linear_results = _time(linear_scan, texts, repeat)
+    search_time, search_results = _time(matcher.search, texts, repeat)
+    scan_time, scan_results = _time(matcher.find_all, texts, repeat)
+
+    assert linear_results == search_results, "matcher disagrees with linear scan"
+    assert [bool(found) for found in scan_results] == linear_results
+
+    print(f"🔎 {count} event texts, {len(matcher.keywords)} keywords "
+          f"({sum(linear_results)} relevant)")
+    for name, elapsed in [
+        ("linear scan", linear_time),
+        ("matcher.search", search_time),
+        ("matcher.find_all", scan_time),
+    ]:
+        print(f"   {name:<17} {elapsed * 1000:8.1f} ms  {count / elapsed:10.0f} texts/s")
+    print(f"   speedup (search vs linear): {linear_time / search_time:.1f}x")
+
+def _item_tag(source):
+    """Opening and closing tag for an element matching a source's item selector."""
+    first = source['items'].split(',')[0].strip()
+    if first.startswith('.'):
+        return f'<div class="{first[1:]}">', '</div>'
+    return f'<{first}>', f'</{first}>'
+
+def make_listing_page(source, count, seed=42):
+    """Generate a listing page with count items matching a source's selectors."""
+    rng = random.Random(seed)
+    open_tag, close_tag = _item_tag(source)
+    keywords = EventScraper.SUSTAINABILITY_KEYWORDS
+    parts = [
+        '<!DOCTYPE html><html><head><title>Kalender</title>',
+        '<script>' + 'var tracking = {};' * 200 + '</script>',
+        '<style>' + '.x { color: red; }' * 200 + '</style></head><body>',
+        '<header><nav>' + ''.join(f'<a href="/menu/{i}">Menu {i}</a>' for i in range(40)) + '</nav></header>',
+        '<main>',
+    ]
+    for i in range(count):
+        words = rng.choices(FILLER_WORDS, k=rng.randint(10, 30))
+        if rng.random() < 0.5:
+            words.insert(0, rng.choice(keywords))
+        title = ' '.join(words[:4]).capitalize()
+        parts.append(
+            f'{open_tag}<h2 class="title entry-title event-title"><a href="/event/{i}">{title}</a></h2>'
+            f'<span class="date event-date post-date">{rng.randint(1, 28)}. marts</span>'
+            f'<span class="location venue place">Aarhus C</span>'
+            f'<p class="description excerpt entry-content summary">{" ".join(words)}</p>'
+            f'<img src="/img/{i}.jpg" alt="">{close_tag}'
+        )
+    parts.append('</main><footer>' + '<p>Footer tekst</p>' * 50 + '</footer></body></html>')
+    return ''.join(parts).encode('utf-8')
+
+def legacy_extract(source, soup):
+    """Per-call selector strings, the way the old scrape_* functions worked."""
+    events = []
+    for item in soup.select(source['items'])[:source['limit']]:
+        title_elem = item.select_one(source['title'])
+        if source.get('link_in_title') and title_elem:
+            link_elem = title_elem.select_one('a')
+        else:
+            link_elem = item.select_one('a[href]')
+        if not title_elem or not link_elem:
+            continue
+        fields = {}
+        for field in ('description', 'date', 'location'):
+            elem = item.select_one(source[field]) if source.get(field) else None
+            fields[field] = elem.get_text(strip=True) if elem else ''
+        events.append({'title': title_elem.get_text(strip=True),
+                       'link': urljoin(source['url'], link_elem['href']), **fields})
+    return events
+
+def bench_extract(count=500, repeat=3):
+    """Compare per-item extraction cost of the registry engine and the old code."""
+    print(f"🧩 extracting {count} items per source")
+    for source in EventScraper.SOURCES:
+        source = dict(source, limit=count)
+        soup = BeautifulSoup(make_listing_page(source, count), 'html.parser')
+
+        legacy_best = engine_best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            legacy_events = legacy_extract(source, soup)
+            legacy_best = min(legacy_best, time.perf_counter() - start)
+            start = time.perf_counter()
+            engine_events = EventScraper.extract_events(source, soup)
+            engine_best = min(engine_best, time.perf_counter() - start)
+
+        assert [e['title'] for e in legacy_events] == [e['title'] for e in engine_events]
+        print(f"   {source['name']:<20} legacy {legacy_best / count * 1e6:7.1f} us/item"
+              f"   engine {engine_best / count * 1e6:7.1f} us/item")
+
+def record_pages(pages_dir):
+    """Save the live listing page of every source for offline benchmarks."""
+    os.makedirs(pages_dir, exist_ok=True)
+    for source in EventScraper.SOURCES:
+        try:
+            response = EventScraper.polite_get(source['url'])
+        except Exception as e:
+            print(f"   Error recording {source['name']}: {e}")
+            continue
+        path = os.path.join(pages_dir, f"{source['name']}.html")
+        with open(path, 'wb') as f:
+            f.write(response.content)
+        print(f"💾 {source['name']}: {len(response.content)} bytes -> {path}")
+
+def load_pages(pages_dir=None, count=25):
+    """Return (source, page bytes) for stored pages, or generated ones."""
+    pages = []
+    for source in EventScraper.SOURCES:
+        path = os.path.join(pages_dir, f"{source['name']}.html") if pages_dir else None
+        if path and os.path.exists(path):
+            with open(path, 'rb') as f:
+                pages.append((source, f.read()))
+        else:
+            pages.append((source, make_listing_page(source, count)))
+    return pages
+
+def _measure_parse(source, content, backend, subtree, repeat):
+    """Best parse time and peak Python heap (tracemalloc) for one combination."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        EventScraper.parse_listing(source, content, backend, subtree)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    EventScraper.parse_listing(source, content, backend, subtree)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+def bench_parse(pages_dir=None, repeat=3):
+    """Compare parse time and peak memory of each parser backend and mode."""
+    backends = ['html.parser']
+    try:
+        import lxml  # noqa: F401
+        backends.insert(0, 'lxml')
+    except ImportError:
+        print("   lxml is not installed, only html.parser is measured")
+
+    pages = load_pages(pages_dir)
+    totals = {}
+    for source, content in pages:
+        print(f"📄 {source['name']} ({len(content) // 1024} KiB)")
+        for backend in backends:
+            for subtree in (False, True):
+                elapsed, peak = _measure_parse(source, content, backend, subtree, repeat)
+                mode = 'subtree' if subtree else 'full'
+                total = totals.setdefault((backend, mode), [0.0, 0])
+                total[0] += elapsed
+                total[1] = max(total[1], peak)
+                print(f"   {backend:<12} {mode:<8} {elapsed * 1000:8.1f} ms  "
+                      f"peak {peak / 1024:8.0f} KiB")
+
+    print("📊 all pages")
+    for (backend, mode), (elapsed, peak) in totals.items():
+        print(f"   {backend:<12} {mode:<8} {elapsed * 1000:8.1f} ms  "
+              f"max peak {peak / 1024:8.0f} KiB")
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """Serve one recorded page for every path, optionally slowly.
+
+    latency is the delay in seconds before the response starts; with a
+    drip_rate (bytes per second) the body is sent in small timed chunks.
+    """
+
+    protocol_version = 'HTTP/1.1'
+    page = b''
+    latency = 0.0
+    drip_rate = None
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(self.page)))
+        self.end_headers()
+        try:
+            if not self.drip_rate:
+                self.wfile.write(self.page)
+                return
+            chunk_size = max(1, int(self.drip_rate * 0.05))
+            for start in range(0, len(self.page), chunk_size):
+                self.wfile.write(self.page[start:start + chunk_size])
+                self.wfile.flush()
+                time.sleep(0.05)
+        except (BrokenPipeError, ConnectionResetError):
+            # Streaming mode hangs up once it has enough items
+            pass
+
+    def handle(self):
+        try:
+            super().handle()
+        except ConnectionResetError:
+            # Pooled keep-alive connections are dropped by the client
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+def serve_fixtures(pages, latency=0.0, drip_rate=None):
+    """Start one local server per source and return (servers, local sources).
+
+    Every source gets its own port, so per-host politeness does not
+    serialize the benchmark the way a single shared host would.
+    """
+    servers = []
+    sources = []
+    for source, content in pages:
+        handler = type('Handler', (FixtureHandler,),
+                       {'page': content, 'latency': latency, 'drip_rate': drip_rate})
+        server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        host, port = server.server_address
+        sources.append(dict(source, url=f"http://{host}:{port}/{source['name']}"))
+    return servers, sources
+
+def _measure_stage(func, repeat):
+    """Best time over repeat calls, then peak traced memory of one more call."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, result
+
+def _stage_result(seconds, peak, amount, unit):
+    return {'seconds': seconds, 'peak_bytes': peak, unit: amount,
+            f"{unit}_per_second": amount / seconds if seconds else None}
+
+def bench_run(pages_dir=None, items=25, latency=0.0, drip_rate=None, repeat=3,
+              output='bench_results.json', stream=False):
+    """Run the scraper end to end against local fixture servers.
+
+    Times and traces the whole run, then each stage on its own: fetch,
+    parse, filter (extract and classify), dedup, categorize and write.
+    Results are written as JSON to output. The per-host delay is turned
+    off, as repeated runs would otherwise mostly measure politeness waits.
+    """
+    pages = load_pages(pages_dir, items)
+    servers, sources = serve_fixtures(pages, latency, drip_rate)
+    EventScraper.configure_cache(None)
+    EventScraper.configure_store(None)
+    EventScraper.configure_parser(subtree=True, stream=stream)
+    EventScraper.configure_metrics(None, None)
+    host_delay, EventScraper.HOST_DELAY = EventScraper.HOST_DELAY, 0
+    quiet = contextlib.redirect_stdout(io.StringIO())
+    previous_dir = os.getcwd()
+    results = {
+        'generated': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'config': {'pages': pages_dir or 'generated', 'items': items, 'latency': latency,
+                   'drip_rate': drip_rate, 'repeat': repeat, 'stream': stream,
+                   'parser': EventScraper.PARSER_BACKEND},
+        'stages': {},
+    }
+    stages = results['stages']
+
+    try:
+        with tempfile.TemporaryDirectory() as workdir, quiet:
+            os.chdir(workdir)
+            EventScraper.configure_output(os.path.join(workdir, 'events'))
+
+            seconds, peak, _ = _measure_stage(lambda: EventScraper.main(sources=sources), repeat)
+            results['end_to_end'] = {'seconds': seconds, 'peak_bytes': peak}
+            results['sources'] = EventScraper.run_metrics()
+
+            def fetch_all():
+                with EventScraper.ThreadPoolExecutor(EventScraper.MAX_WORKERS) as pool:
+                    return sum(pool.map(lambda source: len(EventScraper.polite_get(source['url']).content),
+                                        sources))
+            seconds, peak, fetched = _measure_stage(fetch_all, repeat)
+            stages['fetch'] = _stage_result(seconds, peak, fetched, 'bytes')
+
+            local_pages = [(source, content) for source, (_, content) in zip(sources, pages)]
+            seconds, peak, soups = _measure_stage(
+                lambda: [EventScraper.parse_listing(source, content) for source, content in local_pages], repeat)
+            stages['parse'] = _stage_result(seconds, peak, sum(len(content) for _, content in pages), 'bytes')
+
+            def extract_and_filter():
+                candidates = [EventScraper.extract_events(source, soup)
+                              for (source, _), soup in zip(local_pages, soups)]
+                return candidates, [EventScraper.classify_events(list(events), source.get('filter', True))
+                                    for (source, _), events in zip(local_pages, candidates)]
+            seconds, peak, (candidates, filtered) = _measure_stage(extract_and_filter, repeat)
+            stages['filter'] = _stage_result(seconds, peak, sum(map(len, candidates)), 'items')
+
+            relevant = [event for events in filtered for event in events]
+            copies = lambda: [dict(event) for event in relevant]
+            seconds, peak, cleaned = _measure_stage(
+                lambda: EventScraper.clean_and_deduplicate_events(copies()), repeat)
+            stages['dedup'] = _stage_result(seconds, peak, len(relevant), 'events')
+
+            seconds, peak, categorized = _measure_stage(
+                lambda: sorted(EventScraper.iter_categorized_events([dict(event) for event in cleaned]),
+                               key=EventScraper.chronological_key), repeat)
+            stages['categorize'] = _stage_result(seconds, peak, len(cleaned), 'events')
+
+            seconds, peak, _ = _measure_stage(
+                lambda: EventScraper.write_output(categorized, sources), repeat)
+            stages['write'] = _stage_result(seconds, peak, len(categorized), 'events')
+    finally:
+        EventScraper.HOST_DELAY = host_delay
+        os.chdir(previous_dir)
+        for server in servers:
+            server.shutdown()
+            server.server_close()
+
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+
+    print(f"🏁 end to end {results['end_to_end']['seconds'] * 1000:8.1f} ms  "
+          f"peak {results['end_to_end']['peak_bytes'] / 1024:8.0f} KiB")
+    for name, stage in stages.items():
+        unit = next(key for key in stage if key.endswith('_per_second'))
+        print(f"   {name:<11} {stage['seconds'] * 1000:8.1f} ms  peak {stage['peak_bytes'] / 1024:8.0f} KiB  "
+              f"{stage[unit] or 0:12.0f} {unit.replace('_', ' ')}")
+    print(f"📁 Results saved to '{output}'")
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark EventScraper stages")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    keywords_parser = subparsers.add_parser('keywords', help="keyword matcher throughput")
+    keywords_parser.add_argument('--texts', type=int, default=5000)
+    keywords_parser.add_argument('--repeat', type=int, default=3)
+
+    extract_parser = subparsers.add_parser('extract', help="per-item extraction cost")
+    extract_parser.add_argument('--items', type=int, default=500)
+    extract_parser.add_argument('--repeat', type=int, default=3)
+
+    record_parser = subparsers.add_parser('record', help="save live source pages")
+    record_parser.add_argument('--pages', default='bench_pages')
+
+    parse_parser = subparsers.add_parser('parse', help="parser backend time and memory")
+    parse_parser.add_argument('--pages', help="directory of pages saved by 'record'")
+    parse_parser.add_argument('--repeat', type=int, default=3)
+
+    run_parser = subparsers.add_parser('run', help="end-to-end and per-stage run against local servers")
+    run_parser.add_argument('--pages', help="directory of pages saved by 'record'")
+    run_parser.add_argument('--items', type=int, default=25,
+                            help="items per generated page when a source has no recorded page")
+    run_parser.add_argument('--latency', type=float, default=0,
+                            help="milliseconds before each response starts")
+    run_parser.add_argument('--drip', type=float,
+                            help="send response bodies at this many KiB/s")
+    run_parser.add_argument('--stream', action='store_true', help="use streaming listing parsing")
+    run_parser.add_argument('--repeat', type=int, default=3)
+    run_parser.add_argument('--output', default='bench_results.json')
+
+    args = parser.parse_args()
+    if args.command == 'keywords':
+        bench_keywords(args.texts, args.repeat)
+    elif args.command == 'extract':
+        bench_extract(args.items, args.repeat)
+    elif args.command == 'record':
+        record_pages(args.pages)
+    elif args.command == 'parse':
+        bench_parse(args.pages, args.repeat)
+    elif args.command == 'run':
+        bench_run(args.pages, args.items, args.latency / 1000,
+                  args.drip * 1024 if args.drip else None, args.repeat, args.output, args.stream)
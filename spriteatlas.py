@@ -0,0 +1,226 @@
+"""Pack icons into one trimmed, background-removed sprite atlas.
+
+Writes the atlas PNG and a JSON map with each icon's rectangle in the atlas
+and where the trimmed rectangle sat in the original icon. The atlas is only
+rebuilt when a member icon or a setting changes.
+
+Run with: python spriteatlas.py
+          python spriteatlas.py 'images/p*.png' --output assets/p-icons.png --padding 4
+"""
+import argparse
+import math
+import os
+
+from PIL import Image
+
+import removebg
+
+WASTE_ICONS = (
+    "images/glas.png",
+    "images/farlig.png",
+    "images/mad.png",
+    "images/metal.png",
+    "images/pap.png",
+    "images/papir.png",
+    "images/plast.png",
+    "images/rest.png",
+)
+ATLAS_PATH = "assets/waste-atlas.png"
+PADDING = 2
+MAX_WIDTH = 2048
+
+
+def _fits(free, w, h):
+    return free[2] >= w and free[3] >= h
+
+
+def _split(free, used):
+    """Parts of the free rectangle free that the placed rectangle used does not cover."""
+    fx, fy, fw, fh = free
+    ux, uy, uw, uh = used
+    if ux >= fx + fw or ux + uw <= fx or uy >= fy + fh or uy + uh <= fy:
+        return [free]
+    parts = []
+    if ux > fx:
+        parts.append((fx, fy, ux - fx, fh))
+    if ux + uw < fx + fw:
+        parts.append((ux + uw, fy, fx + fw - ux - uw, fh))
+    if uy > fy:
+        parts.append((fx, fy, fw, uy - fy))
+    if uy + uh < fy + fh:
+        parts.append((fx, uy + uh, fw, fy + fh - uy - uh))
+    return parts
+
+
+def _contained(a, b):
+    return (a[0] >= b[0] and a[1] >= b[1]
+            and a[0] + a[2] <= b[0] + b[2] and a[1] + a[3] <= b[1] + b[3])
+
+
+def maxrects_pack(sizes, width):
+    """Place (w, h) sizes in a strip of the given width with MaxRects best-short-side-fit.
+
+    Returns a position per size (in the input order) and the height used,
+    or None when some size is wider than the strip.
+    """
+    if any(w > width for w, _ in sizes):
+        return None
+    free = [(0, 0, width, sum(h for _, h in sizes))]
+    positions = [None] * len(sizes)
+    order = sorted(range(len(sizes)), key=lambda i: (-max(sizes[i]), -min(sizes[i]), i))
+
+    for i in order:
+        w, h = sizes[i]
+        best = min(
+            (f for f in free if _fits(f, w, h)),
+            key=lambda f: (min(f[2] - w, f[3] - h), max(f[2] - w, f[3] - h), f[1], f[0]),
+        )
+        used = (best[0], best[1], w, h)
+        positions[i] = used[:2]
+        free = [part for f in free for part in _split(f, used)]
+        free = [f for j, f in enumerate(free)
+                if not any(j != k and _contained(f, g) and (f != g or j > k)
+                           for k, g in enumerate(free))]
+
+    height = max((y + sizes[i][1] for i, (x, y) in enumerate(positions)), default=0)
+    return positions, height
+
+
+def pack(sizes, max_width=MAX_WIDTH):
+    """Pack sizes into the smallest-area atlas tried, preferring squarer ones.
+
+    Strip widths from the widest item up to max_width around the square
+    root of the total area are tried.
+    """
+    widest = max(w for w, _ in sizes)
+    area = sum(w * h for w, h in sizes)
+    candidates = {min(max_width, max(widest, round(math.sqrt(area) * f / 10)))
+                  for f in range(8, 21)}
+    candidates.add(min(max_width, sum(w for w, _ in sizes)))
+
+    best = None
+    for width in sorted(candidates):
+        packed = maxrects_pack(sizes, width)
+        if packed is None:
+            continue
+        positions, height = packed
+        used_width = max(x + w for (x, _), (w, _) in zip(positions, sizes))
+        key = (used_width * height, abs(used_width - height))
+        if best is None or key < best[0]:
+            best = (key, positions, used_width, height)
+    if best is None:
+        raise ValueError(f"An icon is wider than the maximum atlas width {max_width}")
+    return best[1], best[2], best[3]
+
+
+def load_icon(path, remove_bg=True, threshold=220):
+    """The icon as RGBA trimmed to its visible pixels, plus the trim box."""
+    img = Image.open(path)
+    img = removebg.clear_outer_background(img, threshold) if remove_bg else img.convert("RGBA")
+    box = img.getchannel("A").getbbox() or (0, 0, 1, 1)
+    return img.crop(box), box, img.size
+
+
+def frame_names(paths):
+    names = {}
+    for path in paths:
+        name = os.path.splitext(os.path.basename(path))[0]
+        if name in names:
+            raise ValueError(f"Two icons are named {name!r}: {names[name]} and {path}")
+        names[name] = path
+    return {path: name for name, path in names.items()}
+
+
+def map_path(atlas_path):
+    return os.path.splitext(atlas_path)[0] + ".json"
+
+
+def is_current(atlas_map, members, settings, atlas_path):
+    """True when the map was built from these member hashes and settings and the atlas is intact."""
+    return (
+        atlas_map is not None
+        and atlas_map.get("members") == members
+        and atlas_map.get("settings") == settings
+        and os.path.exists(atlas_path)
+        and removebg.file_hash(atlas_path) == atlas_map.get("hash")
+    )
+
+
+def build_atlas(patterns=WASTE_ICONS, atlas_path=ATLAS_PATH, padding=PADDING,
+                max_width=MAX_WIDTH, remove_bg=True, threshold=220, force=False):
+    """Build the atlas and its JSON map unless a member icon or setting changed."""
+    paths = removebg.expand_inputs(patterns)
+    if not paths:
+        raise ValueError("No icons to pack")
+    names = frame_names(paths)
+    members = {path: removebg.file_hash(path) for path in paths}
+    settings = {"padding": padding, "max_width": max_width,
+                "remove_bg": remove_bg, "threshold": threshold}
+    json_path = map_path(atlas_path)
+
+    if not force and is_current(removebg.load_manifest(json_path) or None, members,
+                                settings, atlas_path):
+        print(f"✅ {atlas_path} is up to date ({len(paths)} icons)")
+        return removebg.load_manifest(json_path)
+
+    icons = [load_icon(path, remove_bg, threshold) for path in paths]
+    sizes = [(icon.width + padding, icon.height + padding) for icon, _, _ in icons]
+    positions, width, height = pack(sizes, max_width)
+
+    atlas = Image.new("RGBA", (width - padding, height - padding) if padding else (width, height))
+    frames = {}
+    for path, (icon, box, source_size), (x, y) in zip(paths, icons, positions):
+        atlas.paste(icon, (x, y))
+        frames[names[path]] = {
+            "x": x, "y": y, "w": icon.width, "h": icon.height,
+            "source_w": source_size[0], "source_h": source_size[1],
+            "offset_x": box[0], "offset_y": box[1],
+        }
+
+    os.makedirs(os.path.dirname(atlas_path) or ".", exist_ok=True)
+    tmp = atlas_path + ".tmp"
+    atlas.save(tmp, format="PNG", optimize=True)
+    os.replace(tmp, atlas_path)
+
+    atlas_map = {
+        "image": os.path.basename(atlas_path),
+        "hash": removebg.file_hash(atlas_path),
+        "width": atlas.width,
+        "height": atlas.height,
+        "frames": frames,
+        "members": members,
+        "settings": settings,
+    }
+    removebg.save_manifest(json_path, atlas_map)
+
+    icon_bytes = sum(os.path.getsize(path) for path in paths)
+    fill = sum(icon.width * icon.height for icon, _, _ in icons) / (atlas.width * atlas.height)
+    print(f"🧩 Packed {len(paths)} icons into {atlas_path} ({atlas.width}x{atlas.height}, "
+          f"{fill:.0%} filled): {os.path.getsize(atlas_path) / 1024:.1f} KiB "
+          f"in 1 request instead of {icon_bytes / 1024:.1f} KiB in {len(paths)}")
+    return atlas_map
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Pack icons into one trimmed, background-removed sprite atlas"
+    )
+    parser.add_argument("inputs", nargs="*", default=list(WASTE_ICONS),
+                        help="icon files, directories or glob patterns "
+                             "(default: the waste-category icons)")
+    parser.add_argument("--output", default=ATLAS_PATH,
+                        help="atlas PNG; the JSON map is written next to it")
+    parser.add_argument("--padding", type=int, default=PADDING,
+                        help="transparent pixels between icons")
+    parser.add_argument("--max-width", type=int, default=MAX_WIDTH,
+                        help="widest atlas to consider")
+    parser.add_argument("--threshold", type=int, default=220,
+                        help="channel value above which a pixel counts as background")
+    parser.add_argument("--keep-bg", action="store_true",
+                        help="pack the icons as they are, without removing their background")
+    parser.add_argument("--force", action="store_true",
+                        help="rebuild even if no member icon changed")
+    args = parser.parse_args()
+
+    build_atlas(args.inputs, args.output, args.padding, args.max_width,
+                not args.keep_bg, args.threshold, args.force)